@@ -5,14 +5,131 @@
 """Utilities for emitting filtered L5K text from selection structures."""
 
 from __future__ import annotations
-from typing import List
-import re
+from typing import TYPE_CHECKING, AbstractSet, BinaryIO, Callable, Iterable, Mapping, TextIO, TypeVar
 
-from .l5k_types import SelectionDict
+from .l5k_types import LineSink, SelectionDict
 from . import models
 
+if TYPE_CHECKING:
+    from .l5k_parser import L5KParser
 
-def export_whitelist(parser, selection: SelectionDict) -> str:
+# Shared default for missing selection entries (no per-AOI/program allocation)
+_EMPTY: frozenset[str] = frozenset()
+
+_T = TypeVar("_T")
+
+# AOI header templates (indent is prefixed once per export)
+_AOI_HDR_DESC_T = 'ADD_ON_INSTRUCTION_DEFINITION {} (Description := "{}")'
+_AOI_HDR_NODESC_T = "ADD_ON_INSTRUCTION_DEFINITION {} ()"
+
+
+def _selected_names(items: Mapping[str, object], sel: AbstractSet[str] | Mapping[str, object]) -> Iterable[str]:
+    """
+    Names of `items` that are in `sel`, in the project's (insertion) order.
+    Empty selections skip the scan entirely; otherwise the membership test runs in C via filter().
+    """
+    if not sel or not items:
+        return ()
+    return filter(sel.__contains__, items)
+
+
+def _selected_values(items: Mapping[str, _T], sel: AbstractSet[str]) -> Iterable[_T]:
+    """
+    Objects of `items` whose names are in `sel`, in the project's (insertion) order.
+    When the selection covers the whole collection (the usual "everything checked" case)
+    the values are returned as-is, skipping the per-item membership test and lookup.
+    """
+    if not sel or not items:
+        return ()
+    if len(sel) >= len(items) and items.keys() <= sel:
+        return items.values()
+    return map(items.__getitem__, filter(sel.__contains__, items))
+
+
+def _emit_tags(out: LineSink, tags: Iterable[models.Tag], pref: str) -> None:
+    """
+    Emit value-free TAG lines for `tags` with line prefix `pref`.
+    Inlined equivalent of Tag.to_l5k_into for the controller/program tag loops, which
+    carry most of the exported lines; one extend per block instead of one call per tag.
+    """
+    out.extend(
+        f'{pref}{t.name} : {t.data_type} (Description := "{t.description}");' if t.description
+        else f"{pref}{t.name} : {t.data_type};"
+        for t in tags
+    )
+
+
+class _LineWriter:
+    """
+    List-like sink (append/extend) that streams lines to `write` as they are emitted.
+    Lines are newline-separated exactly like "\n".join, so the file matches export_whitelist().
+    """
+    __slots__ = ("_write", "_sep")
+
+    def __init__(self, write: Callable[[str], object]) -> None:
+        self._write = write
+        self._sep = ""
+
+    def append(self, line: str) -> None:
+        write = self._write
+        write(self._sep)
+        write(line)
+        self._sep = "\n"
+
+    def extend(self, lines: Iterable[str]) -> None:
+        # One write per block rather than two per line
+        if not isinstance(lines, (list, tuple)):
+            lines = list(lines)
+        if not lines:
+            return
+        write = self._write
+        write(self._sep)
+        write("\n".join(lines))
+        self._sep = "\n"
+
+
+class _BytesLineWriter:
+    """
+    Binary counterpart of _LineWriter: each block is encoded once into a bytearray,
+    which is handed to `write` whenever it grows past `flush_size` (call flush() at the end).
+    """
+    __slots__ = ("_write", "_sep", "_buf", "_encoding", "_flush_size")
+
+    def __init__(self, write: Callable[[bytes], object], encoding: str = "utf-8",
+                 flush_size: int = 1 << 18) -> None:
+        self._write = write
+        self._sep = b""
+        self._buf = bytearray()
+        self._encoding = encoding
+        self._flush_size = flush_size
+
+    def append(self, line: str) -> None:
+        buf = self._buf
+        buf += self._sep
+        buf += line.encode(self._encoding)
+        self._sep = b"\n"
+        if len(buf) >= self._flush_size:
+            self.flush()
+
+    def extend(self, lines: Iterable[str]) -> None:
+        if not isinstance(lines, (list, tuple)):
+            lines = list(lines)
+        if not lines:
+            return
+        buf = self._buf
+        buf += self._sep
+        buf += "\n".join(lines).encode(self._encoding)
+        self._sep = b"\n"
+        if len(buf) >= self._flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buf:
+            self._write(self._buf)
+            self._buf = bytearray()
+
+
+def export_whitelist(parser: L5KParser, selection: SelectionDict) -> str:
     """
     Construct a clean L5K from the parsed Project and the selection:
     - Header
@@ -24,114 +141,157 @@ def export_whitelist(parser, selection: SelectionDict) -> str:
     - END_CONTROLLER
     Everything else is omitted by design.
     """
+    # Plain amortized growth on purpose: preallocating ([None] * n plus an index) or pre-extending
+    # measured slower, and list.clear() gives the reserved capacity straight back anyway
     out: list[str] = []
+    _emit_whitelist(parser, selection, out)
+    return "\n".join(out)
+
+
+def export_whitelist_to_file(parser: L5KParser, selection: SelectionDict, fp: TextIO) -> None:
+    """
+    Same output as export_whitelist(), written line by line to the open text file `fp`
+    so the full export is never held in memory as one string.
+    """
+    _emit_whitelist(parser, selection, _LineWriter(fp.write))
+
+
+def export_whitelist_to_binary(parser: L5KParser, selection: SelectionDict, fp: BinaryIO, encoding: str = "utf-8") -> None:
+    """
+    Same output as export_whitelist(), encoded with `encoding` and written to the binary file `fp`
+    in large chunks. Newlines are written as-is ("\n"); use the text variant for platform line endings.
+    """
+    writer = _BytesLineWriter(fp.write, encoding)
+    _emit_whitelist(parser, selection, writer)
+    writer.flush()
+
+
+def _emit_whitelist(parser: L5KParser, selection: SelectionDict, out: LineSink) -> None:
+    """Emit the whitelist export lines into `out` (a list or anything with append/extend)."""
+    out_append = out.append
+    out_extend = out.extend
+    project = parser.project
+    _encode = parser._encode_l5k_string
+    render_prog_header = parser._render_program_header_line
 
     # Ensure header/controller header are present on this parser instance
     parser._ensure_header_for_export()
     parser._ensure_controller_header()
 
-    # 1) Header
-    hdr_obj = getattr(parser.project, "header", None)
-    header_blob = parser.header_text or (hdr_obj.content if hdr_obj and getattr(hdr_obj, "content", None) else "")
+    # 1) Header (_ensure_header_for_export leaves header_text as a str, copied from project.header if needed)
+    header_blob = parser.header_text
     if header_blob:
-        out.append(header_blob.rstrip("\n"))
-        out.append("")
+        # Parsed headers never end in a newline; only copy the blob when one has to be trimmed
+        if header_blob.endswith("\n"):
+            header_blob = header_blob.rstrip("\n")
+        out_extend((header_blob, ""))
 
     # 2) CONTROLLER header
-    hdr_lines = getattr(parser, "controller_header_lines", None)
+    hdr_lines = parser.controller_header_lines
     if hdr_lines:
-        out.extend(hdr_lines)
+        out_extend(hdr_lines)
     else:
         # Fallback if no capture (should not happen if _capture_controller_header ran)
-        cname = getattr(parser, "controller_name", None) or "Controller"
-        out.append(f"CONTROLLER {cname}")
+        cname = parser.controller_name or "Controller"
+        out_append(f"CONTROLLER {cname}")
 
     indent = "\t"             # one-level indent for sections inside CONTROLLER
 
+    # Indents and fixed section lines are built once rather than per AOI/program
+    i1 = indent
+    i2 = i1 + i1
+    i3 = i2 + i1
+    i2_TAG = f"{i2}TAG"
+    i2_PARAMETERS = f"{i2}PARAMETERS"
+    i2_LOCAL_TAGS = f"{i2}LOCAL_TAGS"
+    # Section footers carry their trailing blank line(s) inline ("X\n" joins as X + blank line),
+    # so each footer is one element instead of several
+    params_footer = f"{i2}END_PARAMETERS\n"
+    aoi_end = f"{i1}END_ADD_ON_INSTRUCTION_DEFINITION\n"
+    aoi_footer = f"{i2}END_LOCAL_TAGS\n\n{aoi_end}"
+    ctrl_tags_footer = f"{i1}END_TAG\n"
+    prog_footer = f"{i2}END_TAG\n{i1}END_PROGRAM\n"
+    aoi_hdr_desc = (i1 + _AOI_HDR_DESC_T).format
+    aoi_hdr_nodesc = (i1 + _AOI_HDR_NODESC_T).format
+    placeholder = f'{i3}__PlaceHolder : BOOL (Description := "Required for AVEVA Edge");'
+
     # 3) UDTs
-    udt_sel = selection.get("udts", set())
-    for name, udt in parser.project.udts.items():
-        if name not in udt_sel:
-            continue
-        out.extend(udt.to_l5k(indent))
-        out.append("")  # blank line for readability
+    udt_sel = selection.get("udts", _EMPTY)
+    udts = project.udts
+    for udt in _selected_values(udts, udt_sel):
+        udt.to_l5k_into(out, indent)
+        out_append("")  # blank line for readability
 
     # 4) AOIs (filtered; no ENCODED_DATA emission)
-    aoi_sel = selection.get("aois", set())
+    aoi_sel = selection.get("aois", _EMPTY)
     params_sel_map = selection.get("aoi_parameters", {})
     locals_sel_map = selection.get("aoi_localtags", {})
 
-    for name, aoi in parser.project.aois.items():
-        sel_params = params_sel_map.get(name, set())
-        sel_locals = locals_sel_map.get(name, set())
+    # An AOI is emitted when selected outright or when any of its params/locals are
+    aoi_wanted = set(aoi_sel)
+    aoi_wanted.update(n for n, s in params_sel_map.items() if s)
+    aoi_wanted.update(n for n, s in locals_sel_map.items() if s)
 
-        if (name not in aoi_sel) and not sel_params and not sel_locals:
-            continue
+    aois = project.aois
+    for name in _selected_names(aois, aoi_wanted):
+        aoi = aois[name]
+        sel_params = params_sel_map.get(name, _EMPTY)
+        sel_locals = locals_sel_map.get(name, _EMPTY)
 
-        # AOI header
-        desc = getattr(aoi, "description", "")
-        if isinstance(desc, str) and desc.strip():
-            enc = parser._encode_l5k_string(desc)
-            out.append(f'{indent}ADD_ON_INSTRUCTION_DEFINITION {name} (Description := "{enc}")')
+        # AOI header (AOI.description is always a str)
+        desc = aoi.description
+        if desc and not desc.isspace():
+            out_append(aoi_hdr_desc(name, _encode(desc)))
         else:
-            out.append(f"{indent}ADD_ON_INSTRUCTION_DEFINITION {name} ()")
+            out_append(aoi_hdr_nodesc(name))
 
         # PARAMETERS section (only when there are parameters selected)
         if sel_params:
-            out.append(f"{indent*2}PARAMETERS")
-            for pname, p in aoi.parameters.items():
-                if pname in sel_params:
-                    out.extend(p.to_l5k(level=3, indent=indent))
-            out.append(f"{indent*2}END_PARAMETERS")
-            out.append("") # blank line for readability
-
-        # LOCAL_TAGS section (only selected locals; include placeholder if none)
-        out.append(f"{indent*2}LOCAL_TAGS")
+            out_append(i2_PARAMETERS)
+            for p in _selected_values(aoi.parameters, sel_params):
+                p.to_l5k_into(out, 3, indent)
+            out_append(params_footer)  # blank line for readability
+
+        # LOCAL_TAGS section (only selected locals; include placeholder if none).
+        # AOIs pulled in only by selected parameters get no (empty) LOCAL_TAGS block.
+        if not sel_locals and name not in aoi_sel:
+            out_append(aoi_end)
+            continue
+
+        out_append(i2_LOCAL_TAGS)
         emitted_local = 0
-        for lname, t in aoi.localtags.items():
-            if lname in sel_locals:
-                out.extend(t.to_l5k(level=3, indent=indent))
-                emitted_local += 1
+        for t in _selected_values(aoi.localtags, sel_locals):
+            t.to_l5k_into(out, 3, indent)
+            emitted_local += 1
 
         if emitted_local == 0 and name in aoi_sel:
-            out.append(f'{indent*3}__PlaceHolder : BOOL (Description := "Required for AVEVA Edge");')
+            out_append(placeholder)
 
-        out.append(f"{indent*2}END_LOCAL_TAGS")
-        out.append("")  # blank line for readability
-        out.append(f"{indent}END_ADD_ON_INSTRUCTION_DEFINITION")
-        out.append("")  # blank line for readability
+        # blank lines for readability
+        out_append(aoi_footer)
 
     # 5) Controller TAGS (value-free; you already store cleaned definitions)
-    tag_sel = selection.get("tags", set())
+    tag_sel = selection.get("tags", _EMPTY)
     if tag_sel:
-        out.append(f"{indent}TAG")
+        out_append(f"{i1}TAG")
         # Preserve original order by iterating project.tags and filtering by selection
-        for tname, tag in parser.project.tags.items():
-            if tname not in tag_sel:
-                continue
-            # prints name + type (+ Description) without values
-            out.extend(tag.to_l5k(level=2, indent=indent))
-        out.append(f"{indent}END_TAG")
-        out.append("")
+        tags = project.tags
+        # prints name + type (+ Description) without values
+        _emit_tags(out, _selected_values(tags, tag_sel), i2)
+        out_append(ctrl_tags_footer)
 
     # 6) Program TAG blocks
     program_tag_sel = selection.get("program_tags", {})
-    for pname, prog in parser.project.programs.items():
-        sel_prog_tags = program_tag_sel.get(pname, set())
+    programs = project.programs
+    for pname in _selected_names(programs, program_tag_sel):
+        sel_prog_tags = program_tag_sel[pname]
         if not sel_prog_tags:
             continue
+        prog = programs[pname]
 
-        out.append(parser._render_program_header_line(prog, indent))
-        out.append(f"{indent*2}TAG")
-        for tname, tag in prog.tags.items():
-            if tname in sel_prog_tags:
-                out.extend(tag.to_l5k(level=3, indent=indent))
-        out.append(f"{indent*2}END_TAG")
-        out.append(f"{indent}END_PROGRAM")
-        out.append("")
+        out_extend((render_prog_header(prog, indent), i2_TAG))
+        _emit_tags(out, _selected_values(prog.tags, sel_prog_tags), i3)
+        out_append(prog_footer)
 
     # 7) END_CONTROLLER
-    out.append("END_CONTROLLER")
-    out.append("")  # trailing newline
-
-    return "\n".join(out)
+    out_append("END_CONTROLLER\n")  # trailing newline
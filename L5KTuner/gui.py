@@ -6,13 +6,14 @@
 
 
 import atexit
-import json
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk, scrolledtext
-from typing import Dict, Optional, Any, Set
+# filedialog and json are imported where they are used: neither is needed to bring the window up
+from tkinter import messagebox, ttk, scrolledtext
+from typing import AbstractSet, Dict, Iterable, Optional, Any, Set
 import os
 import logging
 import concurrent.futures
+import multiprocessing
 
 from . import models
 from .models import MemberType
@@ -23,6 +24,28 @@ from .utils import get_log_path
 
 logger = logging.getLogger(__name__)
 
+# Members added unchecked when the tree is built (AOI/UDT execution bits)
+_UNCHECKED_BY_DEFAULT = frozenset(("EnableIn", "EnableOut"))
+
+
+def _write_json_worker(file_path: str, data: dict[str, Any], project: dict[str, Any] | str) -> str:
+    """
+    Serialize and write a project payload (runs on the executor; no Tk access).
+    `project` is the "project" section, either as a dict or as the JSON text returned by an
+    earlier call; the section's JSON text is returned so an unchanged project is encoded once.
+    """
+    import json
+    # The "project" key is spliced onto the end of `data` below; a second copy would be a
+    # duplicate key, which json.loads() silently resolves to the last one
+    assert "project" not in data
+    # One-shot dumps() without indent takes the C encoder; json.dump() and indent=... both fall
+    # back to the pure-Python iterencode (~6x slower on large projects)
+    project_json = project if isinstance(project, str) else json.dumps(project, separators=(",", ":"))
+    head = json.dumps(data, separators=(",", ":"))
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(f'{head[:-1]},"project":{project_json}}}')
+    return project_json
+
 
 class L5KTunerApp:
     """
@@ -32,9 +55,21 @@ class L5KTunerApp:
     """
     def __init__(self, master: tk.Tk) -> None:
         self.master = master
-        # Async parsing executor (keeps UI responsive)
+        # Background file I/O (project save/open) runs on a thread; parsing is CPU-bound and runs
+        # in a worker process (started on first import and kept for later ones) so neither the
+        # regex work nor its garbage collection competes with the Tk main loop
         self._executor: Optional[concurrent.futures.Executor] = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._parse_executor: Optional[concurrent.futures.Executor] = None
         self._parse_future = None
+        # Merge parses share the worker process; (file path, parser kept for export) of the pending one
+        self._merge_future: Optional[concurrent.futures.Future] = None
+        self._merge_job: Optional[tuple[str, l5kp.L5KParser]] = None
+        # Project file save/open jobs on the same executor (see _poll_save_future/_poll_open_future)
+        self._save_future: Optional[concurrent.futures.Future] = None
+        # (file path, dirty snapshot, project) of the pending save
+        self._save_target: Optional[tuple[str, Optional[tuple[int, int]], models.L5KProject]] = None
+        self._open_future: Optional[concurrent.futures.Future] = None
+        self._open_path: Optional[str] = None
 
         master.title("L5K File Processor")
         screen_w = master.winfo_screenwidth()
@@ -55,8 +90,29 @@ class L5KTunerApp:
         self._last_source_label: str = ""
         self._filter_mode: str = "all"  # 'all' | 'enabled' | 'disabled'
         self._filter_var = tk.StringVar(value=self._filter_mode)
-        self._saved_snapshot: Optional[str] = None
+        # Dirty tracking: (project revision, checkbox state hash) at the last save/load.
+        # The revision is bumped whenever project content is replaced or merged; checkbox
+        # changes are tracked incrementally by TreeState.state_hash.
+        self._project_rev: int = 0
+        self._saved_snapshot: Optional[tuple[int, int]] = None
+        self._project_keys_cache: Optional[tuple[models.L5KProject, int, frozenset]] = None
+        # JSON text of the "project" section from the last save; checkbox-only saves reuse it
+        # until the revision changes (text is far smaller than keeping the dict form around)
+        self._project_json_cache: Optional[tuple[models.L5KProject, int, str]] = None
+        # (filter mode, project revision, checkbox state hash) -> iids kept by that filter
+        self._filter_cache: dict[tuple[str, int, int], AbstractSet[str]] = {}
+        # Counts-panel node groups for the current tree (see _count_groups); cleared on repopulate
+        self._count_index: Optional[tuple[dict, dict]] = None
+        # Tree iid -> model object shown by that node, recorded while the tree is built
+        self._node_objects: Dict[str, Any] = {}
         self._dirty: bool = False
+        self._dirty_check_pending: bool = False
+        self._window_title: Optional[str] = None
+        self._select_after_id: Optional[str] = None
+        self._filter_after_id: Optional[str] = None
+        # Log viewer window and its (text, status label) widgets, kept for reuse
+        self._log_window: Optional[tk.Toplevel] = None
+        self._log_widgets: Optional[tuple[tk.Text, ttk.Label]] = None
 
         self._create_widgets()
         self._set_selection_controls_enabled(False)
@@ -93,8 +149,10 @@ class L5KTunerApp:
         sb.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.configure(yscrollcommand=sb.set)
 
-        # Use select event to update right panel
-        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        # Use select event to update right panel (debounced, see _on_tree_select_event)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select_event)
+        # Children are inserted lazily when a node is first expanded
+        self.tree.bind("<<TreeviewOpen>>", self._on_tree_open)
 
         main.add(left, stretch="always")
 
@@ -110,8 +168,11 @@ class L5KTunerApp:
 
         # Details area
         ttk.Label(self.info, text="Details", anchor='w').pack(fill=tk.X, pady=(10, 2))
-        self.detail_text = tk.Text(self.info, height=14, wrap="word")
+        # Rewritten wholesale on every selection; no undo history to record
+        self.detail_text = tk.Text(self.info, height=14, wrap="word", undo=False, maxundo=0, autoseparators=False)
         self.detail_text.pack(fill=tk.BOTH, expand=True, pady=(0, 8))
+        # Last content written by _set_detail_text (compared instead of reading the widget back)
+        self._detail_content: str = ""
 
         self.select_var = tk.BooleanVar(value=True)
         self.select_checkbox = ttk.Checkbutton(self.info, text="Include this item in export",
@@ -137,6 +198,7 @@ class L5KTunerApp:
     def _build_menubar(self) -> None:
         menubar = tk.Menu(self.master)
         file_menu = tk.Menu(menubar, tearoff=0)
+        self.file_menu = file_menu
         file_menu.add_command(label="Open", command=self._open_project_json, accelerator="Ctrl+O")
         file_menu.add_command(label="Save", command=self._save_project_json, accelerator="Ctrl+S")
         file_menu.add_command(label="Save As...", command=self._save_project_json_as)
@@ -150,11 +212,11 @@ class L5KTunerApp:
         view_menu = tk.Menu(menubar, tearoff=0)
         show_sub = tk.Menu(view_menu, tearoff=0)
         show_sub.add_radiobutton(label="Show All", value="all", variable=self._filter_var,
-                                 command=lambda: self._set_filter_mode("all"))
+                                 command=lambda: self._request_filter_mode("all"))
         show_sub.add_radiobutton(label="Show Enabled", value="enabled", variable=self._filter_var,
-                                 command=lambda: self._set_filter_mode("enabled"))
+                                 command=lambda: self._request_filter_mode("enabled"))
         show_sub.add_radiobutton(label="Show Disabled", value="disabled", variable=self._filter_var,
-                                 command=lambda: self._set_filter_mode("disabled"))
+                                 command=lambda: self._request_filter_mode("disabled"))
         view_menu.add_cascade(label="Show", menu=show_sub)
 
         menubar.add_cascade(label="File", menu=file_menu)
@@ -180,43 +242,62 @@ class L5KTunerApp:
         self._open_project_json()
         return "break"
 
+    # The messages panel keeps only this many trailing lines (older ones are dropped)
+    _MESSAGES_MAX_LINES = 500
+
     def _log_message(self, msg: str) -> None:
         """Append a line to the messages panel and update status bar."""
+        text = self.messages_text
         try:
-            self.messages_text.configure(state="normal")
-            self.messages_text.insert("end", msg.rstrip() + "\n")
-            self.messages_text.see("end")
+            # Only follow the tail when the user has not scrolled up to read older messages
+            at_bottom = text.yview()[1] >= 0.99
+            text.configure(state="normal")
+            text.insert("end", msg.rstrip() + "\n")
+            # Every message ends in "\n" and Tk adds one more, so "end" sits on line count + 2
+            excess = int(text.index("end").split(".")[0]) - 2 - self._MESSAGES_MAX_LINES
+            if excess > 0:
+                text.delete("1.0", f"{excess + 1}.0")
+            if at_bottom:
+                text.see("end")
         finally:
-            self.messages_text.configure(state="disabled")
-
-    def _current_logical_keys(self) -> set[tuple[str, str, Optional[str]]]:
-        keys: set[tuple[str, str, Optional[str]]] = set()
-        for iid in self.tree_state.meta:
-            key = self.tree_state.logical_key_for_iid(iid)
-            if key:
-                keys.add(key)
+            text.configure(state="disabled")
+
+    def _current_logical_keys(self) -> frozenset[tuple[str, str, Optional[str]]]:
+        # TreeState keeps a key -> iid index, so this is a C-level copy rather than a walk
+        return frozenset(self.tree_state.logical_keys())
+
+    def _keys_for_project(self, project: models.L5KProject) -> frozenset[tuple[str, str, Optional[str]]]:
+        """
+        Logical keys for every node of `project`. Results for the loaded project are cached
+        until its revision changes (see _bump_project_rev), so repeated merge previews skip the walk.
+        """
+        cached = self._project_keys_cache
+        if cached is not None and cached[0] is project and cached[1] == self._project_rev:
+            return cached[2]
+        keys = self._compute_project_keys(project)
+        if project is self.project:
+            self._project_keys_cache = (project, self._project_rev, keys)
         return keys
 
-    def _keys_for_project(self, project: models.L5KProject) -> set[tuple[str, str, Optional[str]]]:
-        keys: set[tuple[str, str, Optional[str]]] = set()
-        for name in project.udts.keys():
-            keys.add(("UDT", name, None))
-            for member in project.udts[name].members.values():
-                keys.add(("UDT_MEMBER", member.name, name))
-                for child in getattr(member, "children", {}).values():
-                    keys.add(("UDT_MEMBER", child.name, name))
-        for name in project.aois.keys():
-            keys.add(("AOI", name, None))
-            for param in project.aois[name].parameters.values():
-                keys.add(("AOI_PARAMETER", param.name, name))
-            for local in project.aois[name].localtags.values():
-                keys.add(("AOI_LOCAL_TAG", local.name, name))
-        for name in project.tags.keys():
-            keys.add(("TAG", name, None))
+    @staticmethod
+    def _compute_project_keys(project: models.L5KProject) -> frozenset[tuple[str, str, Optional[str]]]:
+        keys: list[tuple[str, str, Optional[str]]] = []
+        add = keys.append
+        extend = keys.extend
+        for name, udt in project.udts.items():
+            add(("UDT", name, None))
+            for member in udt.members.values():
+                add(("UDT_MEMBER", member.name, name))
+                if member.children:
+                    extend(("UDT_MEMBER", child.name, name) for child in member.children.values())
+        for name, aoi in project.aois.items():
+            add(("AOI", name, None))
+            extend(("AOI_PARAMETER", param.name, name) for param in aoi.parameters.values())
+            extend(("AOI_LOCAL_TAG", local.name, name) for local in aoi.localtags.values())
+        extend(("TAG", name, None) for name in project.tags)
         for pname, prog in project.programs.items():
-            for tname in prog.tags.keys():
-                keys.add(("PROGRAM_TAG", tname, pname))
-        return keys
+            extend(("PROGRAM_TAG", tname, pname) for tname in prog.tags)
+        return frozenset(keys)
 
     def _show_merge_preview(self, file_path: str, new_project: models.L5KProject, new_parser: l5kp.L5KParser,
                             corrected_log: list[str], saved_states: list[dict[str, Any]],
@@ -255,12 +336,13 @@ class L5KTunerApp:
         added_frame = tk.Frame(frame)
         removed_frame = tk.Frame(frame)
 
+        # One Tcl insert call per list instead of one per entry
         added_box = tk.Listbox(added_frame, height=8, selectmode=tk.MULTIPLE, exportselection=False)
-        for k in added:
-            added_box.insert(tk.END, " / ".join(filter(None, k)))
+        if added:
+            added_box.insert(tk.END, *[" / ".join(filter(None, k)) for k in added])
         removed_box = tk.Listbox(removed_frame, height=8, selectmode=tk.MULTIPLE, exportselection=False)
-        for k in removed:
-            removed_box.insert(tk.END, " / ".join(filter(None, k)))
+        if removed:
+            removed_box.insert(tk.END, *[" / ".join(filter(None, k)) for k in removed])
         # preselect all by default
         added_box.selection_set(0, tk.END)
         removed_box.selection_set(0, tk.END)
@@ -325,7 +407,7 @@ class L5KTunerApp:
             self._populate_tree(saved_states=saved_states)
             self._show_summary(corrected_log)
             self._set_selection_controls_enabled(True)
-            self._update_dirty_flag()
+            self._schedule_dirty_check()
             self._filter_mode = "all"
             self._filter_var.set("all")
             self._set_status("Merged updated L5K", base)
@@ -347,6 +429,8 @@ class L5KTunerApp:
         project = self.project
         if project is None:
             return
+        if selected_added or selected_removed:
+            self._bump_project_rev()
 
         # Additions
         for kind, name, parent in selected_added:
@@ -355,7 +439,7 @@ class L5KTunerApp:
             elif kind == "UDT_MEMBER" and parent and parent in new_project.udts and parent in project.udts:
                 member = new_project.udts[parent].members.get(name)
                 if member:
-                    project.udts[parent].members[name] = member
+                    project.udts[parent].add_member(member)
             elif kind == "AOI" and name in new_project.aois:
                 project.aois[name] = new_project.aois[name]
             elif kind == "AOI_PARAMETER" and parent and parent in new_project.aois and parent in project.aois:
@@ -377,15 +461,24 @@ class L5KTunerApp:
                         project.programs[parent].tags[name] = tag_obj
 
         # Removals
+        # UDT name -> child member name -> owning members, built once per UDT on first use
+        child_owners: dict[str, dict[str, list[models.UDTMember]]] = {}
         for kind, name, parent in selected_removed:
             if kind == "UDT":
                 project.udts.pop(name, None)
             elif kind == "UDT_MEMBER" and parent and parent in project.udts:
-                project.udts[parent].members.pop(name, None)
+                udt = project.udts[parent]
+                udt.remove_member(name)
                 # also remove child from any hidden parent if present
-                for m in project.udts[parent].members.values():
-                    if getattr(m, "children", None):
-                        m.children.pop(name, None)
+                owners = child_owners.get(parent)
+                if owners is None:
+                    owners = {}
+                    for m in udt.members.values():
+                        for child_name in m.children:
+                            owners.setdefault(child_name, []).append(m)
+                    child_owners[parent] = owners
+                for m in owners.pop(name, ()):
+                    m.children.pop(name, None)
             elif kind == "AOI":
                 project.aois.pop(name, None)
             elif kind == "AOI_PARAMETER" and parent and parent in project.aois:
@@ -398,25 +491,28 @@ class L5KTunerApp:
                 project.programs[parent].tags.pop(name, None)
 
     def _build_project_state(self) -> Optional[dict[str, Any]]:
+        """Project file payload except the "project" section (see _project_for_save)."""
         if not self.parser or not self.project:
             return None
         return {
             "controller_header_lines": getattr(self.parser, "controller_header_lines", []),
             "controller_name": getattr(self.parser, "controller_name", None),
             "header_text": getattr(self.parser, "header_text", ""),
-            "project": self._project_to_dict(self.project),
             "checkbox_states": self._serialize_checkbox_states(),
         }
 
-    def _snapshot_state(self) -> Optional[str]:
-        state = self._build_project_state()
-        if state is None:
+    def _snapshot_state(self) -> Optional[tuple[int, int]]:
+        """Cheap signature of the savable state; O(1) instead of serializing the project."""
+        if not self.parser or not self.project:
             return None
-        return json.dumps(state, sort_keys=True)
+        return (self._project_rev, self.tree_state.state_hash)
 
-    def _set_saved_snapshot(self, state: Optional[dict[str, Any]] = None) -> None:
-        snapshot = json.dumps(state, sort_keys=True) if state is not None else self._snapshot_state()
-        self._saved_snapshot = snapshot
+    def _bump_project_rev(self) -> None:
+        self._project_rev += 1
+
+    def _set_saved_snapshot(self) -> None:
+        """Mark the current state as saved; the fingerprint never touches the project payload."""
+        self._saved_snapshot = self._snapshot_state()
         self._dirty = False
         self._refresh_window_title()
 
@@ -432,7 +528,21 @@ class L5KTunerApp:
         if self._dirty != was_dirty:
             self._refresh_window_title()
 
+    def _schedule_dirty_check(self) -> None:
+        """Coalesce dirty checks (and the title update they may trigger) into one per idle tick."""
+        if self._dirty_check_pending:
+            return
+        self._dirty_check_pending = True
+        self.master.after_idle(self._run_dirty_check)
+
+    def _run_dirty_check(self) -> None:
+        self._dirty_check_pending = False
+        self._update_dirty_flag()
+
     def _confirm_discard_changes(self, action: str) -> bool:
+        if self._save_future is not None:
+            # Let a background save land first so it counts as saved
+            self._finish_project_save()
         self._update_dirty_flag()
         if not self._dirty:
             return True
@@ -443,11 +553,12 @@ class L5KTunerApp:
         if response is None:
             return False
         if response:
-            return self._save_project_json()
+            return self._save_project_json(wait=True)
         return True
 
     # ---------------- File I/O ----------------
     def _load_file(self) -> None:
+        from tkinter import filedialog
         if not self._confirm_discard_changes("importing a new file"):
             return
         file_path = filedialog.askopenfilename(filetypes=[("L5K Files", "*.l5k;*.L5K"), ("All Files", "*.*")])
@@ -481,12 +592,13 @@ class L5KTunerApp:
             self.load_btn.config(state="disabled")
 
         self.status_label.config(text="Parsing…")
-        executor = self._ensure_executor()
+        executor = self._ensure_parse_executor()
         self._parse_future = executor.submit(l5kp.parse_text_worker, file_content)
         self.master.after(50, self._poll_parse_future)
         return
 
     def _save_file(self) -> None:
+        from tkinter import filedialog
         if not self.parser:
             messagebox.showwarning("Warning", "No file loaded.")
             return
@@ -496,10 +608,10 @@ class L5KTunerApp:
             return
         try:
             selection = self._build_selection_structure()
-            filtered = self.parser.export_whitelist(selection)
 #           filtered = self.parser.get_selected_content(selection)  # type: ignore[union-attr]
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(filtered)
+            # Stream straight to disk through a 1 MiB buffer instead of building the whole export string
+            with open(file_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                self.parser.export_whitelist_to_file(selection, f)
             base = os.path.basename(file_path)
             self._last_source_label = base
             self._set_status("Saved file", base)
@@ -509,10 +621,21 @@ class L5KTunerApp:
         except Exception as e:  # noqa: BLE001
             messagebox.showerror("Error", f"Failed to save file: {e}")
 
-    def _save_project_json(self) -> bool:
+    def _save_project_json(self, wait: bool = False) -> bool:
+        """
+        Save the project file. The payload is built here (it reads the live project and tree),
+        while json.dump and the file write run on the executor and finish in _poll_save_future.
+        With wait=True (unsaved-changes prompts) block until written and return the outcome;
+        otherwise return True once the write is queued.
+        """
         if not self.parser or not self.project:
             messagebox.showwarning("Warning", "No file loaded.")
             return False
+        if self._save_future is not None:
+            if not wait:
+                self._set_status("Saving project…", None)
+                return False
+            self._finish_project_save()
         file_path = self._last_project_path
         if not file_path:
             file_path = self._prompt_save_path()
@@ -524,21 +647,70 @@ class L5KTunerApp:
             if data is None:
                 messagebox.showwarning("Warning", "No file loaded.")
                 return False
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2)
-            self._last_project_path = file_path
-            base = os.path.basename(file_path)
-            self._last_source_label = base
-            self._set_status("Saved project", base)
-            self._set_window_title(file_path)
-            self._log_message("Project saved.")
-            logger.info("Saved project file: %s", file_path)
-            self._set_saved_snapshot(data)
-            return True
+            project = self._project_for_save(self.project)
         except Exception as e:  # noqa: BLE001
             messagebox.showerror("Error", f"Failed to save project: {e}")
             return False
 
+        # The snapshot is taken now: edits made while the file is written still count as unsaved
+        self._save_target = (file_path, self._snapshot_state(), self.project)
+        self._save_future = self._ensure_executor().submit(_write_json_worker, file_path, data, project)
+        self._set_project_save_enabled(False)
+        if wait:
+            return self._finish_project_save()
+        self._set_status("Saving project…", os.path.basename(file_path))
+        self.master.after(50, self._poll_save_future)
+        return True
+
+    def _poll_save_future(self) -> None:
+        fut = self._save_future
+        if fut is None:
+            return
+        if fut.done():
+            self._finish_project_save()
+        else:
+            self.master.after(75, self._poll_save_future)
+
+    def _finish_project_save(self) -> bool:
+        """Wait for the pending save (if still running) and apply its outcome to the UI."""
+        fut = self._save_future
+        target = self._save_target
+        self._save_future = None
+        self._save_target = None
+        if fut is None or target is None:
+            return False
+        file_path, snapshot, project = target
+        self._set_project_save_enabled(True)
+        try:
+            project_json = fut.result()
+        except Exception as e:  # noqa: BLE001
+            messagebox.showerror("Error", f"Failed to save project: {e}")
+            self._set_status("Save failed", None)
+            return False
+        if snapshot is not None:
+            self._project_json_cache = (project, snapshot[0], project_json)
+        self._last_project_path = file_path
+        base = os.path.basename(file_path)
+        self._last_source_label = base
+        self._saved_snapshot = snapshot
+        self._update_dirty_flag()
+        self._set_status("Saved project", base)
+        self._set_window_title(file_path)
+        self._log_message("Project saved.")
+        logger.info("Saved project file: %s", file_path)
+        return True
+
+    def _set_project_save_enabled(self, enabled: bool) -> None:
+        menu = getattr(self, "file_menu", None)
+        if menu is None:
+            return
+        state = tk.NORMAL if enabled else tk.DISABLED
+        for label in ("Save", "Save As..."):
+            try:
+                menu.entryconfig(label, state=state)
+            except tk.TclError:
+                pass
+
     def _save_project_json_as(self) -> bool:
         if not self.parser or not self.project:
             messagebox.showwarning("Warning", "No file loaded.")
@@ -550,6 +722,7 @@ class L5KTunerApp:
         return self._save_project_json()
 
     def _open_project_json(self) -> None:
+        from tkinter import filedialog
         if not self._confirm_discard_changes("opening another project"):
             return
         initialdir = os.path.dirname(self._last_project_path) if self._last_project_path else None
@@ -568,11 +741,41 @@ class L5KTunerApp:
         self._open_project_json_path(file_path)
 
     def _open_project_json_path(self, file_path: str) -> None:
+        """Read and decode the project file on the executor; the UI is rebuilt in _poll_open_future."""
+        if self._open_future is not None:
+            return
+        if getattr(self, "load_btn", None):
+            self.load_btn.config(state="disabled")
+        self._set_status("Opening project…", os.path.basename(file_path))
+        self._open_path = file_path
+        self._open_future = self._ensure_executor().submit(self._read_project_file, file_path)
+        self.master.after(50, self._poll_open_future)
+
+    def _read_project_file(self, file_path: str) -> tuple[dict[str, Any], models.L5KProject]:
+        # Runs on the executor: file + model work only, no Tk access
+        import json
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data, self._project_from_dict(data.get("project", {}))
+
+    def _poll_open_future(self) -> None:
+        fut = self._open_future
+        if fut is None:
+            return
+        if not fut.done():
+            self.master.after(75, self._poll_open_future)
+            return
+
+        self._open_future = None
+        file_path = self._open_path or ""
+        self._open_path = None
+        if getattr(self, "load_btn", None):
+            self.load_btn.config(state="normal")
+        if fut.cancelled():
+            self._set_status("Opening project cancelled", None)
+            return
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            project_dict = data.get("project", {})
-            project = self._project_from_dict(project_dict)
+            data, project = fut.result()
 
             parser = l5kp.L5KParser("")
             parser.project = project
@@ -583,6 +786,7 @@ class L5KTunerApp:
 
             self.project = project
             self.parser = parser
+            self._bump_project_rev()
             self._populate_tree()
             self._restore_checkbox_states(data.get("checkbox_states", []))
             base = os.path.basename(file_path)
@@ -594,42 +798,73 @@ class L5KTunerApp:
             logger.info("Opened project file: %s", file_path)
             self._set_filter_mode("all")
             self._set_selection_controls_enabled(True)
-            self._set_saved_snapshot(data)
+            self._set_saved_snapshot()
         except Exception as e:  # noqa: BLE001
             messagebox.showerror("Error", f"Failed to open project: {e}")
 
     def _prompt_save_path(self) -> Optional[str]:
+        from tkinter import filedialog
         initialdir = os.path.dirname(self._last_project_path) if self._last_project_path else None
         return filedialog.asksaveasfilename(defaultextension=".l5kproj",
                                             filetypes=[("L5K Project", "*.l5kproj"), ("JSON Files", "*.json"), ("All Files", "*.*")],
                                             initialdir=initialdir)
 
+    # Logs larger than this only have their tail loaded into the viewer
+    _LOG_VIEW_MAX_BYTES = 1 << 20
+    _LOG_VIEW_TAIL_BYTES = 256 * 1024
+
     def _show_log(self) -> None:
         log_path = get_log_path()
         content = ""
         try:
-            with open(log_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            with open(log_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > self._LOG_VIEW_MAX_BYTES:
+                    f.seek(-self._LOG_VIEW_TAIL_BYTES, os.SEEK_END)
+                    tail = f.read()
+                    # Start on a line boundary (the seek usually lands mid-line)
+                    nl = tail.find(b"\n")
+                    if nl != -1:
+                        tail = tail[nl + 1:]
+                    content = (f"(Truncated - showing the last {self._LOG_VIEW_TAIL_BYTES // 1024} KB "
+                               f"of {size // 1024} KB.)\n\n") + tail.decode("utf-8", errors="replace")
+                else:
+                    content = f.read().decode("utf-8", errors="replace")
+            # Binary read: normalize Windows line endings like text mode would
+            content = content.replace("\r\n", "\n")
         except FileNotFoundError:
             content = "(Log file not found.)"
         except Exception as e:  # noqa: BLE001
             content = f"(Failed to read log: {e})"
 
-        win = tk.Toplevel(self.master)
-        win.title("Log Viewer")
-        win.geometry("700x500")
-        container = tk.Frame(win)
-        container.pack(fill=tk.BOTH, expand=True)
-        txt = tk.Text(container, wrap="word", state="normal")
+        # The viewer window is built once and hidden on close; reopening only swaps the text
+        win = self._log_window
+        if win is None or not win.winfo_exists():
+            win = tk.Toplevel(self.master)
+            win.title("Log Viewer")
+            win.geometry("700x500")
+            win.protocol("WM_DELETE_WINDOW", win.withdraw)
+            container = tk.Frame(win)
+            container.pack(fill=tk.BOTH, expand=True)
+            txt = tk.Text(container, wrap="word", state="disabled", undo=False)
+            txt.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            # Add scrollbar on the right
+            ysb = ttk.Scrollbar(container, orient="vertical", command=txt.yview)
+            ysb.pack(side=tk.RIGHT, fill=tk.Y)
+            txt.configure(yscrollcommand=ysb.set)
+            status = ttk.Label(win, anchor="w")
+            status.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=(0, 6))
+            self._log_window = win
+            self._log_widgets = (txt, status)
+        else:
+            win.deiconify()
+            win.lift()
+        txt, status = self._log_widgets
+        txt.config(state="normal")
+        txt.delete("1.0", tk.END)
         txt.insert("1.0", content)
         txt.config(state="disabled")
-        txt.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        # Add scrollbar on the right
-        ysb = ttk.Scrollbar(container, orient="vertical", command=txt.yview)
-        ysb.pack(side=tk.RIGHT, fill=tk.Y)
-        txt.configure(yscrollcommand=ysb.set)
-        status = ttk.Label(win, text=f"Log file: {log_path}", anchor="w")
-        status.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=(0, 6))
+        status.configure(text=f"Log file: {log_path}")
 
     def _close_project(self) -> None:
         if not self._confirm_discard_changes("closing the project"):
@@ -641,9 +876,12 @@ class L5KTunerApp:
         self.project = None
         self.parser = None
         self.tree_state.reset()
+        self._count_index = None
+        self._node_objects = {}
+        self._project_json_cache = None
         self.selected_item_id = None
         self.tree.delete(*self.tree.get_children())
-        self.detail_text.delete("1.0", tk.END)
+        self._set_detail_text("")
         self.messages_text.configure(state="normal")
         self.messages_text.delete("1.0", tk.END)
         self.messages_text.configure(state="disabled")
@@ -676,6 +914,9 @@ class L5KTunerApp:
             try:
                 project, corrected_tags_log = fut.result()
             except Exception as e:
+                if isinstance(e, concurrent.futures.BrokenExecutor):
+                    # The worker died (killed, out of memory); start a fresh one next time
+                    self._parse_executor = None
                 messagebox.showerror("Error", f"Failed to parse file:\n{e}")
                 self._set_status("Parse failed", self._last_source_label)
                 if getattr(self, "load_btn", None):
@@ -684,6 +925,7 @@ class L5KTunerApp:
             
             # Adopt the new project so the UI repopulates with fresh data
             self.project = project
+            self._bump_project_rev()
 
             # Keep self.parser in sync so export/save paths keep working
             parser_inst = self.parser
@@ -706,10 +948,18 @@ class L5KTunerApp:
 
 
     # ---------------- Tree Building ----------------
+    # The full hierarchy lives in TreeState; the Treeview only receives the children of
+    # expanded nodes (plus a stub child so unexpanded parents still show an expander).
+    _STUB_SUFFIX = "::__stub__"
+    # Child batches at least this large are inserted while their parent is detached
+    _BULK_INSERT_THRESHOLD = 200
+
     def _populate_tree(self, saved_states: Optional[list[dict[str, Any]]] = None) -> None:
         # Reset
         self.tree.delete(*self.tree.get_children())
         self.tree_state.reset()
+        self._count_index = None
+        self._node_objects = {}
         self.selected_item_id = None
 
         if not self.project:
@@ -723,236 +973,261 @@ class L5KTunerApp:
 
         if saved_states:
             self._restore_checkbox_states(saved_states)
-        self._apply_tree_tags()
         self._apply_filter()
+        self._materialize_children("")
 
-    def _apply_tree_tags(self) -> None:
-        for iid, checked in self.tree_state.checks.items():
-            self._set_tree_item_tag(iid, checked)
+    def _materialize_children(self, item_id: str) -> None:
+        """Insert the children of `item_id` ("" for roots) into the Treeview, once."""
+        state = self.tree_state
+        if item_id in state.materialized:
+            return
+        stub = f"{item_id}{self._STUB_SUFFIX}"
+        if item_id and self.tree.exists(stub):
+            self.tree.delete(stub)
+        state.materialized.add(item_id)
+        children = state.children_of(item_id)
+        tree = self.tree
+
+        # Large batches: take the parent out of the displayed tree while filling it so the
+        # widget lays out once on reattach instead of tracking every insert
+        detached = bool(item_id) and len(children) >= self._BULK_INSERT_THRESHOLD
+        if detached:
+            # Sibling order in TreeState matches the Treeview, so no widget round trips here
+            grandparent = state.parent_of(item_id)
+            index = state.children_of(grandparent).index(item_id)
+            selection = tree.selection()
+            tree.detach(item_id)
+
+        # Raw Tcl calls: Treeview.insert() reformats its keyword options on every call, which
+        # is most of the per-row cost here. Rows go in last-to-first at index 0: ttk resolves
+        # "end" by walking the sibling list on every insert, while index 0 is constant time.
+        call = tree.tk.call
+        w = tree._w
+        checks = state.checks
+        labels = state.labels
+        has_children = state.children
+        stub_suffix = self._STUB_SUFFIX
+        for child in reversed(children):
+            call(w, "insert", item_id, 0, "-id", child, "-text", labels.get(child, ""), "-open", 0,
+                 "-tags", "included" if checks.get(child, False) else "excluded")
+            if has_children.get(child):
+                call(w, "insert", child, "end", "-id", child + stub_suffix, "-text", "")
+
+        if detached:
+            tree.move(item_id, grandparent, index)
+            if selection and tree.selection() != selection:
+                tree.selection_set(selection)
+
+    def _on_tree_open(self, _event: tk.Event | None = None) -> None:
+        item_id = self.tree.focus()
+        if item_id:
+            self._materialize_children(item_id)
+
+    def _ensure_item_visible(self, item_id: str) -> None:
+        """Materialize every ancestor of `item_id` so the item exists in the Treeview."""
+        chain: list[str] = []
+        parent = self.tree_state.parent_of(item_id)
+        while parent:
+            chain.append(parent)
+            parent = self.tree_state.parent_of(parent)
+        for iid in reversed(chain):
+            self._materialize_children(iid)
+
+    def _apply_tree_tags(self, iids: Iterable[str]) -> None:
+        """Re-tag the rows for `iids` (typically the set collected by TreeState.batch())."""
+        checks = self.tree_state.checks
+        set_tag = self._set_tree_item_tag
+        for iid in iids:
+            set_tag(iid, checks.get(iid, False))
 
     def _set_tree_item_tag(self, item_id: str, state: bool) -> None:
+        if not self.tree_state.is_inserted(item_id):
+            return  # tagged on insertion instead
         self.tree.item(item_id, tags=("included" if state else "excluded",))
 
     def _add_header_node(self) -> None:
-        header_id = self.tree.insert("", "end", text="L5K Header", open=False)
-        self.tree_state.set_meta(header_id, TreeNodeMeta(MemberType.HEADER, "L5K Header"))
-        self.tree_state.set_checked(header_id, True)
+        self.tree_state.add_node("", "L5K Header", TreeNodeMeta(MemberType.HEADER, "L5K Header"), True)
 
     def _add_udt_nodes(self) -> None:
         project = self.project
         if not project:
             return
-        udt_root = self.tree.insert("", "end", text="User-Defined Types", open=False)
-        self.tree_state.set_meta(udt_root, TreeNodeMeta(MemberType.ROOT_UDT, "User-Defined Types"))
-        self.tree_state.set_checked(udt_root, True)
+        # Hot loops: bind the callables once rather than resolving them per node
+        add = self.tree_state.add_node
+        Meta = TreeNodeMeta
+        UDT_MEMBER = MemberType.UDT_MEMBER
+        unchecked = _UNCHECKED_BY_DEFAULT
+        objs = self._node_objects
+        udt_root = add("", "User-Defined Types", Meta(MemberType.ROOT_UDT, "User-Defined Types"), True)
 
         for udt in project.udts.values():
-            udt_id = self.tree.insert(udt_root, "end", text=udt.name, open=False)
-            self.tree_state.set_meta(udt_id, TreeNodeMeta(MemberType.UDT, udt.name))
-            self.tree_state.set_checked(udt_id, True)
+            udt_name = udt.name
+            udt_id = add(udt_root, udt_name, Meta(MemberType.UDT, udt_name), True)
+            objs[udt_id] = udt
 
-            for member in udt.members.values():
-                if getattr(member, "parent_word", None):
-                    continue
-                mlabel = member.display_name() if hasattr(member, "display_name") else member.name
-                m_id = self.tree.insert(udt_id, "end", text=f"{mlabel} : {member.data_type}", open=False)
-                self.tree_state.set_meta(m_id, TreeNodeMeta(MemberType.UDT_MEMBER, member.name, parent=udt.name))
-                self.tree_state.set_checked(m_id, (member.name not in ("EnableIn", "EnableOut")))
-
-                for child in getattr(member, "children", {}).values():
-                    clabel = child.display_name() if hasattr(child, "display_name") else child.name
-                    c_id = self.tree.insert(m_id, "end", text=f"{clabel} : {child.data_type}", open=False)
-                    self.tree_state.set_meta(c_id, TreeNodeMeta(MemberType.UDT_MEMBER, child.name, parent=udt.name))
-                    self.tree_state.set_checked(c_id, (child.name not in ("EnableIn", "EnableOut")))
+            for member in udt.visible_members():
+                name = member.name
+                m_id = add(udt_id, member.display_label(),
+                           Meta(UDT_MEMBER, name, parent=udt_name), name not in unchecked)
+                objs[m_id] = member
+
+                for child in member.children.values():
+                    cname = child.name
+                    objs[add(m_id, child.display_label(),
+                             Meta(UDT_MEMBER, cname, parent=udt_name), cname not in unchecked)] = child
 
     def _add_aoi_nodes(self) -> None:
         project = self.project
         if not project:
             return
-        aoi_root = self.tree.insert("", "end", text="Add-On Instructions", open=False)
-        self.tree_state.set_meta(aoi_root, TreeNodeMeta(MemberType.ROOT_AOI, "Add-On Instructions"))
-        self.tree_state.set_checked(aoi_root, True)
+        add = self.tree_state.add_node
+        Meta = TreeNodeMeta
+        AOI_PARAMETER = MemberType.AOI_PARAMETER
+        AOI_LOCAL_TAG = MemberType.AOI_LOCAL_TAG
+        unchecked = _UNCHECKED_BY_DEFAULT
+        objs = self._node_objects
+        aoi_root = add("", "Add-On Instructions", Meta(MemberType.ROOT_AOI, "Add-On Instructions"), True)
 
         for aoi in project.aois.values():
-            aoi_id = self.tree.insert(aoi_root, "end", text=aoi.name, open=False)
-            self.tree_state.set_meta(aoi_id, TreeNodeMeta(MemberType.AOI, aoi.name))
-            self.tree_state.set_checked(aoi_id, True)
+            aoi_name = aoi.name
+            aoi_id = add(aoi_root, aoi_name, Meta(MemberType.AOI, aoi_name), True)
+            objs[aoi_id] = aoi
 
             if aoi.parameters:
-                params_head = self.tree.insert(aoi_id, "end", text="Parameters", open=False)
-                self.tree_state.set_meta(params_head, TreeNodeMeta(MemberType.PARAMS_HEADER, f"{aoi.name} Parameters"))
-                self.tree_state.set_checked(params_head, True)
+                params_head = add(aoi_id, "Parameters",
+                                  Meta(MemberType.PARAMS_HEADER, f"{aoi_name} Parameters"), True)
 
                 for param in aoi.parameters.values():
-                    pid = self.tree.insert(params_head, "end", text=f"{param.name} : {param.data_type}", open=False)
-                    self.tree_state.set_meta(pid, TreeNodeMeta(MemberType.AOI_PARAMETER, param.name, parent=aoi.name))
-                    self.tree_state.set_checked(pid, (param.name not in ("EnableIn", "EnableOut")))
+                    name = param.name
+                    objs[add(params_head, param.display_label(),
+                             Meta(AOI_PARAMETER, name, parent=aoi_name), name not in unchecked)] = param
 
             if aoi.localtags:
-                locals_head = self.tree.insert(aoi_id, "end", text="Local Tags", open=False)
-                self.tree_state.set_meta(locals_head, TreeNodeMeta(MemberType.LOCALS_HEADER, f"{aoi.name} Local Tags"))
-                self.tree_state.set_checked(locals_head, False)
+                locals_head = add(aoi_id, "Local Tags",
+                                  Meta(MemberType.LOCALS_HEADER, f"{aoi_name} Local Tags"), False)
 
                 for local in aoi.localtags.values():
-                    lid = self.tree.insert(locals_head, "end", text=f"{local.name} : {local.data_type}", open=False)
-                    self.tree_state.set_meta(lid, TreeNodeMeta(MemberType.AOI_LOCAL_TAG, local.name, parent=aoi.name))
-                    self.tree_state.set_checked(lid, False)
+                    objs[add(locals_head, local.display_label(),
+                             Meta(AOI_LOCAL_TAG, local.name, parent=aoi_name), False)] = local
 
     def _add_controller_tag_nodes(self) -> None:
         project = self.project
         if not project:
             return
-        tag_root = self.tree.insert("", "end", text="Controller Tags", open=False)
-        self.tree_state.set_meta(tag_root, TreeNodeMeta(MemberType.ROOT_CONTROLLER_TAGS, "Controller Tags"))
-        self.tree_state.set_checked(tag_root, True)
+        add = self.tree_state.add_node
+        Meta = TreeNodeMeta
+        TAG = MemberType.TAG
+        objs = self._node_objects
+        tag_root = add("", "Controller Tags", Meta(MemberType.ROOT_CONTROLLER_TAGS, "Controller Tags"), True)
 
         for tag in project.tags.values():
-            tag_id = self.tree.insert(tag_root, "end", text=f"{tag.name} : {tag.data_type}", open=False)
-            self.tree_state.set_meta(tag_id, TreeNodeMeta(MemberType.TAG, tag.name))
-            self.tree_state.set_checked(tag_id, True)
+            objs[add(tag_root, tag.display_label(), Meta(TAG, tag.name), True)] = tag
 
     def _add_program_tag_nodes(self) -> None:
         project = self.project
         if not project:
             return
+        add = self.tree_state.add_node
+        Meta = TreeNodeMeta
+        TAG = MemberType.TAG
+        objs = self._node_objects
         for prog_name, prog in project.programs.items():
             if not prog.tags:
                 continue
-            prog_root = self.tree.insert("", "end", text=f"{prog_name} Tags", open=False)
-            self.tree_state.set_meta(prog_root, TreeNodeMeta(MemberType.ROOT_PROGRAM_TAGS, prog_name))
-            self.tree_state.set_checked(prog_root, True)
+            prog_root = add("", f"{prog_name} Tags", Meta(MemberType.ROOT_PROGRAM_TAGS, prog_name), True)
 
             for tag in prog.tags.values():
-                pid = self.tree.insert(prog_root, "end", text=f"{tag.name} : {tag.data_type}", open=False)
-                self.tree_state.set_meta(pid, TreeNodeMeta(MemberType.TAG, tag.name, parent=prog_name))
-                self.tree_state.set_checked(pid, True)
+                objs[add(prog_root, tag.display_label(), Meta(TAG, tag.name, parent=prog_name), True)] = tag
 
         # Compute number of number of each type of object
+    def _count_groups(self) -> tuple[dict[tuple[MemberType, Optional[str]], list[str]], dict[MemberType, list[str]]]:
+        """
+        Tree nodes grouped for the Counts panel, built once per tree population:
+        ((node_type, parent name) -> iids, node_type -> iids). UDT members only count when
+        they sit directly under their UDT (BIT children of hidden words are left out).
+        """
+        index = self._count_index
+        if index is None:
+            by_parent: dict[tuple[MemberType, Optional[str]], list[str]] = {}
+            by_type: dict[MemberType, list[str]] = {}
+            state = self.tree_state
+            meta_map = state.meta
+            parents = state.parents
+            for iid, m in meta_map.items():
+                node_type = m.node_type
+                if node_type == MemberType.UDT_MEMBER:
+                    parent_meta = meta_map.get(parents.get(iid, ""))
+                    if parent_meta is None or parent_meta.node_type != MemberType.UDT:
+                        continue
+                by_parent.setdefault((node_type, m.parent), []).append(iid)
+                by_type.setdefault(node_type, []).append(iid)
+            index = self._count_index = (by_parent, by_type)
+        return index
+
     def _counts_for_item(self, item_id: str) -> list[str]:
         lines: list[str] = []
         if not self.project:
             return lines
 
         meta = self.tree_state.get_meta(item_id)
-        if meta and meta.node_type in (
-            MemberType.ROOT_UDT,
-            MemberType.ROOT_AOI,
-            MemberType.ROOT_CONTROLLER_TAGS,
-            MemberType.ROOT_PROGRAM_TAGS,
-        ):
-            if meta.node_type == MemberType.ROOT_UDT:
-                udt_iids = [iid for iid, m in self.tree_state.meta.items() if m.node_type == MemberType.UDT]
-                n_udt = len(udt_iids)
-                included_udt = sum(1 for iid in udt_iids if self.tree_state.get_checked(iid, False))
-                excluded_udt = n_udt - included_udt
-
-                member_iids: list[str] = []
-                for iid, m in self.tree_state.meta.items():
-                    if m.node_type != MemberType.UDT_MEMBER:
-                        continue
-                    parent_iid = self.tree.parent(iid)
-                    if not parent_iid:
-                        continue
-                    parent_meta = self.tree_state.get_meta(parent_iid)
-                    if parent_meta and parent_meta.node_type == MemberType.UDT:
-                        member_iids.append(iid)
-                total_members = len(member_iids)
-                included_members = sum(1 for iid in member_iids if self.tree_state.get_checked(iid, False))
-                excluded_members = total_members - included_members
-
-                lines.append(f"UDTs: {n_udt} (Included: {included_udt}, Excluded: {excluded_udt})")
-                lines.append(
-                    f"UDT members: {total_members} (Included: {included_members}, Excluded: {excluded_members})"
-                )
-                return lines
-            if meta.node_type == MemberType.ROOT_AOI:
-                aoi_iids = [iid for iid, m in self.tree_state.meta.items() if m.node_type == MemberType.AOI]
-                n_aoi = len(aoi_iids)
-                included_aoi = sum(1 for iid in aoi_iids if self.tree_state.get_checked(iid, False))
-                excluded_aoi = n_aoi - included_aoi
-
-                param_iids = [iid for iid, m in self.tree_state.meta.items() if m.node_type == MemberType.AOI_PARAMETER]
-                local_iids = [iid for iid, m in self.tree_state.meta.items() if m.node_type == MemberType.AOI_LOCAL_TAG]
-                total_params = len(param_iids)
-                total_locals = len(local_iids)
-                included_params = sum(1 for iid in param_iids if self.tree_state.get_checked(iid, False))
-                included_locals = sum(1 for iid in local_iids if self.tree_state.get_checked(iid, False))
-
-                lines.append(f"Add-On Instructions: {n_aoi} (Included: {included_aoi}, Excluded: {excluded_aoi})")
-                lines.append(
-                    f"Parameters: {total_params} (Included: {included_params}, Excluded: {total_params - included_params})"
-                )
-                lines.append(
-                    f"Local tags: {total_locals} (Included: {included_locals}, Excluded: {total_locals - included_locals})"
-                )
-                return lines
-            if meta.node_type == MemberType.ROOT_CONTROLLER_TAGS:
-                tag_iids = [
-                    iid
-                    for iid, m in self.tree_state.meta.items()
-                    if m.node_type == MemberType.TAG and m.parent is None
-                ]
-                total_tags = len(tag_iids)
-                included_tags = sum(1 for iid in tag_iids if self.tree_state.get_checked(iid, False))
-                lines.append(
-                    f"Controller tags: {total_tags} (Included: {included_tags}, Excluded: {total_tags - included_tags})"
-                )
-                return lines
-            if meta.node_type == MemberType.ROOT_PROGRAM_TAGS:
-                prog_name = meta.name
-                tag_iids = [
-                    iid
-                    for iid, m in self.tree_state.meta.items()
-                    if m.node_type == MemberType.TAG and m.parent == prog_name
-                ]
-                total_tags = len(tag_iids)
-                included_tags = sum(1 for iid in tag_iids if self.tree_state.get_checked(iid, False))
-                lines.append(
-                    f"Program tags: {total_tags} (Included: {included_tags}, Excluded: {total_tags - included_tags})"
-                )
-                return lines
+        if meta is None:
+            return lines
+        by_parent, by_type = self._count_groups()
+        checks = self.tree_state.checks
+
+        def counted(iids: list[str]) -> tuple[int, int]:
+            """(total, included) for a group of iids."""
+            return len(iids), sum(1 for iid in iids if checks.get(iid, False))
+
+        k = meta.node_type
+        if k == MemberType.ROOT_UDT:
+            n_udt, included_udt = counted(by_type.get(MemberType.UDT, []))
+            total_members, included_members = counted(by_type.get(MemberType.UDT_MEMBER, []))
+            lines.append(f"UDTs: {n_udt} (Included: {included_udt}, Excluded: {n_udt - included_udt})")
+            lines.append(
+                f"UDT members: {total_members} (Included: {included_members}, Excluded: {total_members - included_members})"
+            )
+            return lines
+        if k == MemberType.ROOT_AOI:
+            n_aoi, included_aoi = counted(by_type.get(MemberType.AOI, []))
+            total_params, included_params = counted(by_type.get(MemberType.AOI_PARAMETER, []))
+            total_locals, included_locals = counted(by_type.get(MemberType.AOI_LOCAL_TAG, []))
+            lines.append(f"Add-On Instructions: {n_aoi} (Included: {included_aoi}, Excluded: {n_aoi - included_aoi})")
+            lines.append(
+                f"Parameters: {total_params} (Included: {included_params}, Excluded: {total_params - included_params})"
+            )
+            lines.append(
+                f"Local tags: {total_locals} (Included: {included_locals}, Excluded: {total_locals - included_locals})"
+            )
+            return lines
+        if k == MemberType.ROOT_CONTROLLER_TAGS:
+            total_tags, included_tags = counted(by_parent.get((MemberType.TAG, None), []))
+            lines.append(
+                f"Controller tags: {total_tags} (Included: {included_tags}, Excluded: {total_tags - included_tags})"
+            )
+            return lines
+        if k == MemberType.ROOT_PROGRAM_TAGS:
+            total_tags, included_tags = counted(by_parent.get((MemberType.TAG, meta.name), []))
+            lines.append(
+                f"Program tags: {total_tags} (Included: {included_tags}, Excluded: {total_tags - included_tags})"
+            )
+            return lines
 
         # Object nodes
-        k = meta.node_type if meta else None
-        name = str(meta.name) if meta else ""
+        name = str(meta.name)
 
         if k == MemberType.UDT:
-            udt = self.project.udts.get(name)
-            if udt:
-                member_iids: list[str] = []
-                for iid, m in self.tree_state.meta.items():
-                    if m.node_type != MemberType.UDT_MEMBER or m.parent != name:
-                        continue
-                    parent_iid = self.tree.parent(iid)
-                    if not parent_iid:
-                        continue
-                    parent_meta = self.tree_state.get_meta(parent_iid)
-                    if parent_meta and parent_meta.node_type == MemberType.UDT:
-                        member_iids.append(iid)
-                total_members = len(member_iids)
-                included_members = sum(1 for iid in member_iids if self.tree_state.get_checked(iid, False))
+            if name in self.project.udts:
+                total_members, included_members = counted(by_parent.get((MemberType.UDT_MEMBER, name), []))
                 lines.append(
                     f"Members: {total_members} (Included: {included_members}, Excluded: {total_members - included_members})"
                 )
             return lines
 
         if k == MemberType.AOI:
-            aoi = self.project.aois.get(name)
-            if aoi:
-                param_iids = [
-                    iid
-                    for iid, m in self.tree_state.meta.items()
-                    if m.node_type == MemberType.AOI_PARAMETER and m.parent == name
-                ]
-                local_iids = [
-                    iid
-                    for iid, m in self.tree_state.meta.items()
-                    if m.node_type == MemberType.AOI_LOCAL_TAG and m.parent == name
-                ]
-                total_params = len(param_iids)
-                total_locals = len(local_iids)
-                included_params = sum(1 for iid in param_iids if self.tree_state.get_checked(iid, False))
-                included_locals = sum(1 for iid in local_iids if self.tree_state.get_checked(iid, False))
+            if name in self.project.aois:
+                total_params, included_params = counted(by_parent.get((MemberType.AOI_PARAMETER, name), []))
+                total_locals, included_locals = counted(by_parent.get((MemberType.AOI_LOCAL_TAG, name), []))
                 lines.append(
                     f"Parameters: {total_params} (Included: {included_params}, Excluded: {total_params - included_params})"
                 )
@@ -962,12 +1237,38 @@ class L5KTunerApp:
             return lines
 
         if k == MemberType.TAG:
-            lines.append("Program tag item" if meta and meta.parent else "Tag item")
+            lines.append("Program tag item" if meta.parent else "Tag item")
             return lines
 
         return lines
 
     # ---------------- Selection / Info ----------------
+    # Delay before the details panel follows a selection change; a held arrow key fires
+    # <<TreeviewSelect>> far faster than this, so only the item it stops on is rendered
+    _SELECT_DEBOUNCE_MS = 40
+
+    def _on_tree_select_event(self, _event: tk.Event | None = None) -> None:
+        if self._select_after_id is not None:
+            self.master.after_cancel(self._select_after_id)
+        self._select_after_id = self.master.after(self._SELECT_DEBOUNCE_MS, self._apply_tree_select)
+
+    def _apply_tree_select(self) -> None:
+        self._select_after_id = None
+        self._on_tree_select(None)
+
+    def _flush_pending_select(self) -> bool:
+        """
+        Apply a debounced selection change now, so actions act on (and re-select) the item
+        the user actually selected. Returns True if one was pending.
+        """
+        after_id = self._select_after_id
+        if after_id is None:
+            return False
+        self._select_after_id = None
+        self.master.after_cancel(after_id)
+        self._on_tree_select(None)
+        return True
+
     def _on_tree_select(self, _event: tk.Event | None = None) -> None:
         sel = self.tree.selection()
         if not sel:
@@ -975,7 +1276,8 @@ class L5KTunerApp:
         item_id = sel[0]
         self.selected_item_id = item_id
 
-        text = self.tree.item(item_id, "text")
+        # Same string the row was inserted with; no Treeview round trip
+        text = self.tree_state.labels.get(item_id, "")
         meta = self.tree_state.get_meta(item_id)
         self.title_var.set(text)
 
@@ -989,16 +1291,17 @@ class L5KTunerApp:
             self.select_var.set(self.tree_state.get_checked(item_id, True))
 
         # Render details
-        self.detail_text.delete("1.0", tk.END)
         lines: list[str] = [
             f"Type: {meta.node_type if meta else '?'}",
             f"Name: {meta.name if meta else '?'}"
         ]
         if meta and meta.parent:
             lines.append(f"Parent: {meta.parent}")
-        if " : " in text:
-            _, ttype = text.split(" : ", 1)
-            lines.append(f"Data Type: {ttype.strip()}")
+        # Rows labelled "name : type" are backed by a model object; read the type from it
+        obj = self._node_objects.get(item_id)
+        data_type = getattr(obj, "data_type", None)
+        if data_type:
+            lines.append(f"Data Type: {data_type.strip()}")
 
         # If header, show full header text and return
         if meta and meta.node_type == MemberType.HEADER:
@@ -1011,11 +1314,10 @@ class L5KTunerApp:
             count_lines = self._counts_for_item(item_id)
             if count_lines:
                 lines = ["Counts:"] + [f"\t{ln}" for ln in count_lines] + [""] + lines
-            self.detail_text.insert(tk.END, "\n".join(lines))
+            self._set_detail_text("\n".join(lines))
             return
 
         # Append definition / extra properties when available
-        obj = self._get_model_object(meta)
         if obj is not None:
             # Show Description when available
             desc = getattr(obj, 'description', None)
@@ -1040,58 +1342,42 @@ class L5KTunerApp:
         if count_lines:
             lines = ["Counts:"] + [f"\t{ln}" for ln in count_lines] + [""] + lines
 
-        self.detail_text.insert(tk.END, "\n".join(lines))
+        self._set_detail_text("\n".join(lines))
 
-    def _get_model_object(self, meta: Optional[TreeNodeMeta]) -> Optional[Any]:
-        if not self.project:
-            return None
-        if not meta:
-            return None
-        node_type = meta.node_type
-        name = meta.name
-        if node_type == MemberType.TAG:
-            if meta.parent:
-                prog = self.project.programs.get(str(meta.parent)) if meta.parent else None
-                return prog.tags.get(str(name)) if prog else None
-            return self.project.tags.get(str(name))
-        if node_type == MemberType.UDT:
-            return self.project.udts.get(str(name))
-        if node_type == MemberType.UDT_MEMBER:
-            udt = self.project.udts.get(str(meta.parent)) if meta.parent else None
-            if udt:
-                # Prefer direct member; else search children under hidden words
-                if str(name) in udt.members:
-                    return udt.members[str(name)]
-                for m in udt.members.values():
-                    if getattr(m, "children", None) and str(name) in m.children:
-                        return m.children[str(name)]
-        if node_type == MemberType.AOI:
-            return self.project.aois.get(str(name))
-        if node_type == MemberType.AOI_PARAMETER:
-            aoi = self.project.aois.get(str(meta.parent)) if meta.parent else None
-            return aoi.parameters.get(str(name)) if aoi else None
-        if node_type == MemberType.AOI_LOCAL_TAG:
-            aoi = self.project.aois.get(str(meta.parent)) if meta.parent else None
-            return aoi.localtags.get(str(name)) if aoi else None
-        return None
+    def _set_detail_text(self, content: str) -> None:
+        text = self.detail_text
+        # Re-selecting or toggling an item often renders identical details; skip the redraw then.
+        # The modified flag catches typing in the box since the last render.
+        if content == self._detail_content and not text.edit_modified():
+            return
+        text.delete("1.0", tk.END)
+        text.insert(tk.END, content)
+        text.edit_modified(False)
+        self._detail_content = content
 
     def _set_state(self, item_id: str, state: bool, bubble_up: bool = True) -> None:
-        """Set state for item, propagate down to children, and bubble upwards if requested."""
-        self.tree_state.set_checked(item_id, state)
-        self._set_tree_item_tag(item_id, state)
-        # Downward propagation
-        for child in self.tree.get_children(item_id):
-            self._set_state(child, state, bubble_up=False)
-        # Upward propagation
+        """
+        Set state for item, propagate down to children, and bubble upwards if requested.
+        Rows are not re-tagged here; callers wrap this in TreeState.batch() and tag the changes once.
+        """
+        self.tree_state.set_subtree_checked(item_id, state)
         if bubble_up:
-            new_state = self.tree_state.update_parent_states(self.tree, self.selected_item_id)
-            if new_state is not None and self.selected_item_id:
-                self.select_var.set(new_state)
-            if self.selected_item_id:
-                parent_state = self.tree_state.get_checked(self.selected_item_id, False)
-                self._set_tree_item_tag(self.selected_item_id, parent_state)
+            self._bubble_up_states()
+
+    def _bubble_up_states(self) -> None:
+        """Reconcile parent states with their children and sync the selected item's controls."""
+        new_state = self.tree_state.update_parent_states(self.selected_item_id)
+        if new_state is not None and self.selected_item_id:
+            self.select_var.set(new_state)
+        if self.selected_item_id:
+            parent_state = self.tree_state.get_checked(self.selected_item_id, False)
+            self._set_tree_item_tag(self.selected_item_id, parent_state)
 
     def _toggle_selection(self) -> None:
+        if self._flush_pending_select() and self.selected_item_id is not None:
+            # The checkbox still showed the previous item when clicked; the click toggles the
+            # item that is selected now
+            self.select_var.set(not self.tree_state.get_checked(self.selected_item_id, True))
         if self.selected_item_id is None:
             return
         # Do not allow toggling header
@@ -1100,51 +1386,55 @@ class L5KTunerApp:
             self.select_var.set(True)
             return
         state = bool(self.select_var.get())
-        self._set_state(self.selected_item_id, state, bubble_up=True)
-        self._apply_tree_tags()
-        self._update_dirty_flag()
+        with self.tree_state.batch() as changed:
+            self._set_state(self.selected_item_id, state, bubble_up=True)
+        self._apply_tree_tags(changed)
+        self._schedule_dirty_check()
         self._refresh_selected_details()
 
     def _select_all(self) -> None:
+        self._flush_pending_select()
         targets = tuple(self.tree.selection())
         if not targets:
             return
-        seen = set()
-        for iid in targets:
-            if iid in seen:
-                continue
-            seen.add(iid)
-            self._set_state(iid, True, bubble_up=True)
+        with self.tree_state.batch() as changed:
+            for iid in dict.fromkeys(targets):
+                self._set_state(iid, True, bubble_up=False)
+            # Parents are reconciled once for the whole batch rather than per target
+            self._bubble_up_states()
         # keep the checkbox aligned with the first selected item (or current)
         anchor = self.selected_item_id or targets[0]
         self.select_var.set(self.tree_state.get_checked(anchor, False))
         self._log_message("Selected chosen items (and children).")
-        self._apply_tree_tags()
-        self._update_dirty_flag()
+        self._apply_tree_tags(changed)
+        self._schedule_dirty_check()
         self._refresh_selected_details()
 
     def _deselect_all(self) -> None:
+        self._flush_pending_select()
         targets = tuple(self.tree.selection())
         if not targets:
             return
-        seen = set()
-        for iid in targets:
-            if iid in seen:
-                continue
-            seen.add(iid)
-            self._set_state(iid, False, bubble_up=True)
+        with self.tree_state.batch() as changed:
+            for iid in dict.fromkeys(targets):
+                self._set_state(iid, False, bubble_up=False)
+            self._bubble_up_states()
         anchor = self.selected_item_id or targets[0]
         self.select_var.set(self.tree_state.get_checked(anchor, False))
         self._log_message("Deselected chosen items (and children).")
-        self._apply_tree_tags()
-        self._update_dirty_flag()
+        self._apply_tree_tags(changed)
+        self._schedule_dirty_check()
         self._refresh_selected_details()
 
     def _refresh_selected_details(self) -> None:
+        self._flush_pending_select()
         if not self.selected_item_id:
             return
         if self.selected_item_id not in self.tree.selection():
+            # The row may sit under a collapsed, never-expanded parent
+            self._ensure_item_visible(self.selected_item_id)
             self.tree.selection_set(self.selected_item_id)
+            self.tree.see(self.selected_item_id)
         self._on_tree_select(None)
 
     # Build a structured selection to pass into parser
@@ -1165,39 +1455,35 @@ class L5KTunerApp:
             "program_tags": program_tags,
         }
 
-        for iid, checked in self.tree_state.checks.items():
-            if not checked:
-                continue
-            meta = self.tree_state.get_meta(iid)
-            if not meta:
-                continue
-            node_type = meta.node_type
-            name = str(meta.name)
-            parent = meta.parent
-
-            if node_type == MemberType.TAG and not parent:
-                sel["tags"].add(name)
-
-            elif node_type == MemberType.UDT:
-                sel["udts"].add(name)
-
-            elif node_type == MemberType.UDT_MEMBER and parent:
-                sel["udt_members"].setdefault(str(parent), set()).add(name)
-                sel["udts"].add(str(parent))
-
-            elif node_type == MemberType.AOI:
-                sel["aois"].add(name)
-
-            elif node_type == MemberType.AOI_PARAMETER and parent:
-                sel["aoi_parameters"].setdefault(str(parent), set()).add(name)
-                sel["aois"].add(str(parent))
+        # Walk only checked nodes, one node type at a time (TreeState keeps the buckets current)
+        meta_map = self.tree_state.meta
+        checked = self.tree_state.checked_by_type
 
-            elif node_type == MemberType.AOI_LOCAL_TAG and parent:
-                sel["aoi_localtags"].setdefault(str(parent), set()).add(name)
-                sel["aois"].add(str(parent))
-
-            elif node_type == MemberType.TAG and parent:
-                sel["program_tags"].setdefault(str(parent), set()).add(name)
+        tags: Set[str] = sel["tags"]
+        for iid in checked.get(MemberType.TAG, ()):
+            meta = meta_map[iid]
+            if meta.parent:
+                program_tags.setdefault(meta.parent, set()).add(meta.name)
+            else:
+                tags.add(meta.name)
+
+        udts: Set[str] = sel["udts"]
+        udts.update(meta_map[iid].name for iid in checked.get(MemberType.UDT, ()))
+        for iid in checked.get(MemberType.UDT_MEMBER, ()):
+            meta = meta_map[iid]
+            if meta.parent:
+                udt_members.setdefault(meta.parent, set()).add(meta.name)
+                udts.add(meta.parent)
+
+        aois: Set[str] = sel["aois"]
+        aois.update(meta_map[iid].name for iid in checked.get(MemberType.AOI, ()))
+        for node_type, target in ((MemberType.AOI_PARAMETER, aoi_parameters),
+                                  (MemberType.AOI_LOCAL_TAG, aoi_localtags)):
+            for iid in checked.get(node_type, ()):
+                meta = meta_map[iid]
+                if meta.parent:
+                    target.setdefault(meta.parent, set()).add(meta.name)
+                    aois.add(meta.parent)
 
         return sel
 
@@ -1219,11 +1505,12 @@ class L5KTunerApp:
     def _restore_checkbox_states(self, saved: list[dict[str, Any]]) -> None:
         self.tree_state.restore(saved)
         # reconcile parent states once across the whole tree
-        self.tree_state.update_parent_states(self.tree, None)
+        self.tree_state.update_parent_states(None)
         if self.selected_item_id:
             self.select_var.set(self.tree_state.get_checked(self.selected_item_id, False))
 
     def _merge_updated_l5k(self) -> None:
+        from tkinter import filedialog
         if not self.project:
             messagebox.showwarning("Warning", "Load a project before merging an updated L5K.")
             return
@@ -1239,19 +1526,50 @@ class L5KTunerApp:
             messagebox.showerror("Error", f"Failed to read file: {e}")
             return
 
-        previous_keys = self._keys_for_project(self.project)
-        saved_states = self._serialize_checkbox_states()
+        # Parse in the worker process like an import; the preview opens when it finishes.
+        # The worker gets this same text, so the model and the export-side parser always agree.
+        fut = self._merge_future
+        if fut is not None and not fut.done():
+            fut.cancel()
+        self._merge_job = (file_path, l5kp.L5KParser(file_content))
+        self._set_status("Parsing update…", os.path.basename(file_path))
+        executor = self._ensure_parse_executor()
+        self._merge_future = executor.submit(l5kp.parse_text_worker, file_content)
+        self.master.after(50, self._poll_merge_future)
+
+    def _poll_merge_future(self) -> None:
+        fut = self._merge_future
+        if fut is None:
+            return
+        if not fut.done():
+            self.master.after(75, self._poll_merge_future)
+            return
+        self._merge_future = None
+        job, self._merge_job = self._merge_job, None
+        if fut.cancelled() or job is None:
+            return
+        file_path, new_parser = job
+        base = os.path.basename(file_path)
 
         try:
-            new_parser = l5kp.L5KParser(file_content)
-            new_project, corrected_log = new_parser.parse()
+            new_project, corrected_log = fut.result()
         except Exception as e:  # noqa: BLE001
+            if isinstance(e, concurrent.futures.BrokenExecutor):
+                self._parse_executor = None
+            self._set_status("Parse failed", base)
             messagebox.showerror("Error", f"Failed to parse updated L5K:\n{e}")
             return
+        self._set_status("Parsed update", base)
+        if not self.project:
+            return  # project closed while parsing
+        new_parser.project = new_project
+        new_parser.corrected_tags_log = corrected_log
 
+        previous_keys = self._keys_for_project(self.project)
+        saved_states = self._serialize_checkbox_states()
         new_keys = self._keys_for_project(new_project)
-        added = sorted(new_keys - previous_keys)
-        removed = sorted(previous_keys - new_keys)
+        added = sorted(new_keys.difference(previous_keys))
+        removed = sorted(previous_keys.difference(new_keys))
         self._show_merge_preview(
             file_path=file_path,
             new_project=new_project,
@@ -1262,6 +1580,16 @@ class L5KTunerApp:
             removed=removed,
         )
 
+    def _project_for_save(self, project: models.L5KProject) -> dict[str, Any] | str:
+        """
+        The "project" section for _write_json_worker: the JSON text from the last save while the
+        project revision is unchanged (checked like _keys_for_project), else a fresh dict.
+        """
+        cached = self._project_json_cache
+        if cached is not None and cached[0] is project and cached[1] == self._project_rev:
+            return cached[2]
+        return self._project_to_dict(project)
+
     def _project_to_dict(self, project: models.L5KProject) -> dict[str, Any]:
         data: dict[str, Any] = {
             "header": project.header.content if project.header else "",
@@ -1295,7 +1623,7 @@ class L5KTunerApp:
                             "bit_index": c.bit_index,
                             "name_dims": c.name_dims,
                         }
-                        for c in getattr(m, "children", {}).values()
+                        for c in m.children.values()
                     ]
                 })
             data["udts"].append({
@@ -1313,7 +1641,7 @@ class L5KTunerApp:
                     "data_type": p.data_type,
                     "description": p.description,
                     "definition": p.definition,
-                    "is_bit_alias": getattr(p, "is_bit_alias", False),
+                    "is_bit_alias": p.is_bit_alias,
                 })
             locals_ = []
             for t in aoi.localtags.values():
@@ -1361,8 +1689,9 @@ class L5KTunerApp:
             proj.header = models.L5KHeader(header)
 
         for udt_data in data.get("udts", []):
-            udt = models.UDT(udt_data["name"], udt_data.get("description", ""))
-            udt.family_type = udt_data.get("family_type", "NoFamily")
+            udt = models.UDT(
+                udt_data["name"], udt_data.get("description", ""), udt_data.get("family_type", "NoFamily")
+            )
             for m in udt_data.get("members", []):
                 member = models.UDTMember(
                     m["name"],
@@ -1451,6 +1780,21 @@ class L5KTunerApp:
                 pass
             self._parse_future = None
 
+        merge_fut = self._merge_future
+        if merge_fut is not None and not merge_fut.done():
+            merge_fut.cancel()
+        self._merge_future = None
+        self._merge_job = None
+
+        parse_exec = getattr(self, "_parse_executor", None)
+        if parse_exec is not None:
+            # Do not wait for a parse nobody will read; the worker process is terminated
+            try:
+                parse_exec.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+            self._parse_executor = None
+
         exec_ = getattr(self, "_executor", None)
         if exec_ is not None:
             try:
@@ -1469,6 +1813,18 @@ class L5KTunerApp:
             self._executor = exec_
         return exec_
 
+    def _ensure_parse_executor(self) -> concurrent.futures.Executor:
+        """Return the parse worker process pool, starting it on first use."""
+        exec_ = self._parse_executor
+        if exec_ is None:
+            # Spawn, never fork: a forked child would inherit Tk's X11/notifier state and the
+            # save/open thread's locks. The worker only imports l5k_parser, so startup is cheap.
+            exec_ = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            )
+            self._parse_executor = exec_
+        return exec_
+
     def _set_window_title(self, path: Optional[str]) -> None:
         base = os.path.basename(path) if path else ""
         title = "L5K File Processor"
@@ -1476,7 +1832,10 @@ class L5KTunerApp:
             title = f"{title} - {base}"
         if self._dirty:
             title = f"{title} *"
-        self.master.title(title)
+        # Skip the window-manager round-trip when nothing changed
+        if title != self._window_title:
+            self._window_title = title
+            self.master.title(title)
 
     def _refresh_window_title(self) -> None:
         path = self._last_project_path or self._last_source_label or None
@@ -1489,6 +1848,18 @@ class L5KTunerApp:
             label = f"{text} ... {src}"
         self.status_label.config(text=label)
 
+    # Menu changes rebuild the whole tree; a burst of them only rebuilds for the last one
+    _FILTER_DEBOUNCE_MS = 150
+
+    def _request_filter_mode(self, mode: str) -> None:
+        if self._filter_after_id is not None:
+            self.master.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.master.after(self._FILTER_DEBOUNCE_MS, self._apply_requested_filter_mode, mode)
+
+    def _apply_requested_filter_mode(self, mode: str) -> None:
+        self._filter_after_id = None
+        self._set_filter_mode(mode)
+
     def _set_filter_mode(self, mode: str) -> None:
         saved = self._serialize_checkbox_states()
         self._filter_mode = mode
@@ -1496,7 +1867,18 @@ class L5KTunerApp:
         self._populate_tree(saved_states=saved)
 
     def _apply_filter(self) -> None:
-        apply_filter(self.tree, self.tree_state, self._filter_mode)
+        mode = self._filter_mode
+        if mode == "all":
+            return
+        # Node iids are assigned deterministically by _populate_tree, so the kept set only
+        # depends on the mode, the project content and the checkbox states
+        key = (mode, self._project_rev, self.tree_state.state_hash)
+        cache = self._filter_cache
+        keep = apply_filter(self.tree, self.tree_state, mode, cache.get(key))
+        if keep is not None and key not in cache:
+            if len(cache) >= 4:
+                cache.clear()
+            cache[key] = keep
 
     def _set_selection_controls_enabled(self, enabled: bool) -> None:
         state = tk.NORMAL if enabled else tk.DISABLED
@@ -7,9 +7,9 @@
 
 from __future__ import annotations
 import re
+import sys
 from typing import Set, Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import textwrap
 
 from . import models
 from .l5k_types import SelectionDict
@@ -20,22 +20,48 @@ from .strings import (
     split_outer_attrs,
     encode_l5k_string,
     dedent_lines,
+    dedent_join,
     get_desc,
-    set_desc,
     strip_attrs,
     RE_DESC,
 )
 from .patterns import (
+    RE_DATATYPE_NAME,
+    RE_AOI_DEF_NAME,
     RE_CONTROLLER_HDR,
     RE_UDT_TYPEFIRST,
+    RE_UDT_MEMBER_TYPEFIRST,
+    RE_UDT_MEMBER_NAMEFIRST,
     RE_UDT_BIT_ALIAS,
     RE_FAMILYTYPE,
     RE_AOI_PARAM_DEF,
     RE_AOI_PARAM,
+    RE_AOI_PARAM_TYPE_DECL,
     RE_AOI_LOCALTAG,
+    RE_ENCODED_NAME,
+    RE_TAG_NAME,
     RE_TAG_PREFIX,
 )
 
+# Shared default for missing selection entries (no per-line allocation during export)
+_EMPTY: frozenset = frozenset()
+
+# Characters that can change TagBuffer's scanning state
+_TAG_SPECIAL = re.compile(r"""[$'"()\[\]{};]""")
+# Outside strings, chunks with none of these can only complete a statement with ';'
+_TAG_NESTING = re.compile(r"""['"()\[\]{}]""")
+# Block keywords _parse_structures / get_selected_content switch on (prefix match, same as
+# the startswith checks it replaces; no keyword is a prefix of another)
+_BLOCK_KEYWORD = re.compile(
+    r"(?:END_)?(?:CONTROLLER|TAG|DATATYPE|ADD_ON_INSTRUCTION_DEFINITION|ENCODED_DATA|PROGRAM|ROUTINE)"
+)
+# A whole ROUTINE ... END_ROUTINE block (rung logic carries nothing the structure parser keeps)
+_ROUTINE_BLOCK = re.compile(r"^[ \t]*ROUTINE\b.*?^[ \t]*END_ROUTINE\b", re.MULTILINE | re.DOTALL)
+# AOI sub-section delimiter lines (stripped)
+_AOI_SECTION_MARKERS = frozenset(("PARAMETERS", "END_PARAMETERS", "LOCAL_TAGS", "END_LOCAL_TAGS"))
+# Leading whitespace of a line (same characters str.lstrip() removes)
+_LEADING_WS = re.compile(r"\s*")
+
 @dataclass
 class TagBuffer:
     """
@@ -57,43 +83,60 @@ class TagBuffer:
 
     def feed(self, chunk: str) -> bool:
         self.parts.append(chunk)
+        if not (self.in_sq or self.in_dq) and _TAG_NESTING.search(chunk) is None:
+            # Plain text such as value continuation lines: the state cannot change
+            return self.depth == 0 and ';' in chunk
         complete = False
-        for ch in chunk:
-            if self.in_sq:
-                if self.esc:
-                    self.esc = False
-                elif ch == '$':
-                    self.esc = True
-                elif ch == "'":
-                    self.in_sq = False
-                continue
-            if self.in_dq:
-                if self.esc:
-                    self.esc = False
-                elif ch == '$':
-                    self.esc = True
-                elif ch == '"':
-                    self.in_dq = False
+        depth = self.depth
+        in_sq = self.in_sq
+        in_dq = self.in_dq
+        pos = 0
+        if self.esc and chunk:
+            # '$' ended the previous chunk inside a string: its escaped character starts this one
+            pos = 1
+            self.esc = False
+        n = len(chunk)
+        # Only quote/escape/bracket/';' characters change state; the regex engine skips the
+        # runs of ordinary characters between them
+        search = _TAG_SPECIAL.search
+        while True:
+            m = search(chunk, pos)
+            if m is None:
+                break
+            ch = m.group()
+            pos = m.end()
+            if in_sq or in_dq:
+                if ch == '$':
+                    # Skip the escaped character (it may be a quote)
+                    if pos < n:
+                        pos += 1
+                    else:
+                        self.esc = True
+                elif ch == "'" and in_sq:
+                    in_sq = False
+                elif ch == '"' and in_dq:
+                    in_dq = False
                 continue
 
             if ch == "'":
-                self.in_sq = True
-                continue
-            if ch == '"':
-                self.in_dq = True
-                continue
-            if ch in '([{':
-                self.depth += 1
-                continue
-            if ch in ')]}':
-                if self.depth > 0:
-                    self.depth -= 1
-                continue
-            if ch == ';' and self.depth == 0:
+                in_sq = True
+            elif ch == '"':
+                in_dq = True
+            elif ch in '([{':
+                depth += 1
+            elif ch in ')]}':
+                if depth > 0:
+                    depth -= 1
+            elif ch == ';' and depth == 0:
                 complete = True
+        self.depth = depth
+        self.in_sq = in_sq
+        self.in_dq = in_dq
         return complete
 
     def flush(self) -> str:
+        # One join sized up front (a single-line statement comes back as-is); the separating
+        # spaces stay, since descriptions split across lines rely on them
         stmt = " ".join(self.parts)
         self.reset()
         return stmt
@@ -112,19 +155,6 @@ class ParseState:
     cur_program: Optional[str] = None
 
 
-@dataclass
-class ExportState:
-    in_udt: bool = False
-    in_aoi: bool = False
-    in_params: bool = False
-    in_locals: bool = False
-    in_controller: bool = False
-    in_routine: bool = False
-    in_tags: bool = False
-    current_udt: Optional[str] = None
-    current_aoi: Optional[str] = None
-
-
 class L5KParser:
     """
     Parses L5K files and supports:
@@ -150,6 +180,7 @@ class L5KParser:
         self.controller_name: str | None = None
         self.controller_header_lines: list[str] = []
         self.header_text: str = ""
+        self._base_type_cache: Dict[Tuple[str, str], str] = {}
 
     # ---------- Public API ----------
     def parse(self) -> Tuple[models.L5KProject, List[str]]:
@@ -171,21 +202,22 @@ class L5KParser:
         start: Optional[int] = None
         end: Optional[int] = None
 
-        # Find open
+        # One pass: find the open line, then the close line after it.
+        # A BOM can only lead the first line of the file.
+        open_match = self.HEADER_OPEN_RE.match
+        close_match = self.HEADER_CLOSE_RE.match
         for i, ln in enumerate(lines):
-            s = ln.lstrip('\ufeff').rstrip('\r\n')
-            if self.HEADER_OPEN_RE.match(s.strip()):
-                start = i
+            if i == 0:
+                ln = ln.lstrip('\ufeff')
+            if start is None:
+                if open_match(ln.strip()):
+                    start = i
+            elif close_match(ln.strip()):
+                end = i
                 break
         if start is None:
             return  # no header
 
-        # Find close
-        for j in range(start, n):
-            s = lines[j].lstrip('\ufeff').rstrip('\r\n')
-            if self.HEADER_CLOSE_RE.match(s.strip()):
-                end = j
-                break
         if end is None:
             end = start  # malformed header; at least include the open line
 
@@ -198,6 +230,30 @@ class L5KParser:
         if hasattr(self.project, "header"):
             self.project.header = models.L5KHeader(header_text)  # type: ignore[attr-defined]
 
+    def _routine_spans(self) -> Dict[int, int]:
+        """
+        Map the line index of each ROUTINE header to the index of its END_ROUTINE line.
+        The blocks are located with one regex pass over file_content, so routine bodies
+        (usually the bulk of an L5K) never go through the per-line loop. Returns {} if
+        file_content has line breaks other than '\n' / '\r\n', where '\n' counts would not
+        line up with splitlines() indices.
+        """
+        fc = self.file_content
+        if not fc or len(self.lines) != fc.count("\n") + (not fc.endswith("\n")):
+            return {}
+        spans: Dict[int, int] = {}
+        count = fc.count
+        line = 0
+        pos = 0
+        for m in _ROUTINE_BLOCK.finditer(fc):
+            start, end = m.span()
+            line += count("\n", pos, start)
+            first = line
+            line += count("\n", start, end)
+            pos = end
+            spans[first] = line
+        return spans
+
     def _parse_structures(self) -> None:
         """
         State machine to collect UDTs and AOIs into self.project.*
@@ -220,35 +276,53 @@ class L5KParser:
         current_struct = None
         tag_buf = TagBuffer(parts=[])
         prog_tag_buf = TagBuffer(parts=[])
-
-        def capture_block(start_idx: int) -> Tuple[str, int]:
+        # Completed TAG statements, parsed into Tags a block at a time (at END_TAG/END_PROGRAM)
+        tag_stmts: List[str] = []
+        prog_tag_stmts: List[str] = []
+
+        # Per-line hot loop: bind the matchers and model classes to locals once
+        paren_delta = utils.paren_delta
+        udt_typefirst_match = RE_UDT_TYPEFIRST.match
+        udt_bit_alias_match = RE_UDT_BIT_ALIAS.match
+        aoi_param_match = RE_AOI_PARAM.match
+        aoi_local_match = RE_AOI_LOCALTAG.match
+        block_keyword = _BLOCK_KEYWORD.match
+        # Data type names repeat heavily across members/parameters; keep one shared copy of each
+        intern = sys.intern
+        routine_end = self._routine_spans()
+        UDT, AOI = models.UDT, models.AOI
+        UDTMember, AOIParameter, AOILocalTag = models.UDTMember, models.AOIParameter, models.AOILocalTag
+
+        def capture_block(start_idx: int, first: str) -> Tuple[str, int]:
             """
             Capture from start_idx up to and including a line that ends with ');'.
+            `first` is lines[start_idx] already stripped by the caller.
             Returns (joined_text, next_index_after_block).
             """
-            acc = [lines[start_idx].rstrip("\n")]
+            # self.lines comes from splitlines(), so lines never carry a trailing "\n"
+            raw_first = lines[start_idx]
             j = start_idx + 1
 
-            first = lines[start_idx].strip()
             # If first line obviously single-line (ends with ';' and no '('), return it
             # 1) ends with ');' (with or without '(')
             # 2) or has no '(' and ends with ';'
-            if first.endswith(');') or ( '(' not in first and first.endswith(';') ):
-                text = textwrap.dedent("\n".join(acc)).strip("\n")
-                return text, j
-            
-            depth = utils.paren_delta(lines[start_idx])
+            # Both need a trailing ';', so lines without one are rejected by a single test
+            if first.endswith(';') and ('(' not in first or first.endswith(');')):
+                # dedent of a single non-blank line is just its leading blanks removed
+                return raw_first.lstrip(" \t"), j
+
+            acc = [raw_first]
+            depth = paren_delta(first)
             while j < n:
-                line_j = lines[j].rstrip("\n")
+                line_j = lines[j]
                 acc.append(line_j)
-                depth += utils.paren_delta(line_j)
-                if depth == 0 and line_j.strip().endswith(';'):
+                depth += paren_delta(line_j)
+                if depth == 0 and line_j.rstrip().endswith(';'):
                     j += 1
                     break
                 j += 1
             
-            text = textwrap.dedent("\n".join(acc)).strip("\n")
-            return text, j
+            return dedent_join(acc), j
 
         while i < n:
             raw = lines[i]
@@ -256,235 +330,243 @@ class L5KParser:
             if not stripped:
                 i += 1
                 continue
+            if routine_end:
+                end = routine_end.get(i)
+                if end is not None:
+                    i = end + 1
+                    continue
 
-            # --- Controller / Tags transitions
-            if stripped.startswith("CONTROLLER"):
-                state.in_controller = True
+            # Only lines opening with a block keyword can change blocks; everything else
+            # (the bulk of a file: tag, member and parameter lines) skips the checks below
+            m = block_keyword(stripped)
+            kw = m.group() if m else None
+            if kw is not None:
+                # --- Controller / Tags transitions
+                if kw == "CONTROLLER":
+                    state.in_controller = True
+
+                    # Capture header exactly once with proper delimiter
+                    if not getattr(self, "controller_header_lines", None):
+                        hdr, j, ctrl_name = self._capture_controller_header(lines, i)
+                        self.controller_header_lines = hdr          # list[str]
+                        self.controller_name = ctrl_name            # optional, if you want to use it later
+                        i = j
+                        continue
 
-                # Capture header exactly once with proper delimiter
-                if not getattr(self, "controller_header_lines", None):
-                    hdr, j, ctrl_name = self._capture_controller_header(lines, i)
-                    self.controller_header_lines = hdr          # list[str]
-                    self.controller_name = ctrl_name            # optional, if you want to use it later
-                    i = j
+                    i += 1
+                    continue
+                elif kw == "END_CONTROLLER":
+                    state.in_controller = False
+                    i += 1
                     continue
 
-                i += 1
-                continue
-            elif stripped.startswith("END_CONTROLLER"):
-                state.in_controller = False
-                i += 1
-                continue
-
-            if state.in_controller and (not state.in_program) and stripped == "TAG":
-                state.in_tags = True
-                tag_buf.reset()
-                i += 1
-                continue
-            elif state.in_controller and (not state.in_program) and stripped == "END_TAG":
-                # flush any partial tag before closing
-                if tag_buf.parts:
-                    self._emit_tag_spec(tag_buf.flush())
-                else:
+                if state.in_controller and (not state.in_program) and stripped == "TAG":
+                    state.in_tags = True
                     tag_buf.reset()
-                state.in_tags = False
-                i += 1
-                continue
+                    i += 1
+                    continue
+                elif state.in_controller and (not state.in_program) and stripped == "END_TAG":
+                    # flush any partial tag before closing
+                    if tag_buf.parts:
+                        tag_stmts.append(tag_buf.flush())
+                    else:
+                        tag_buf.reset()
+                    self._emit_tag_specs(tag_stmts)
+                    tag_stmts.clear()
+                    state.in_tags = False
+                    i += 1
+                    continue
 
-            if state.in_program and stripped == "TAG":
-                state.in_prog_tags = True
-                prog_tag_buf.reset()
-                i += 1
-                continue
-            elif state.in_program and stripped == "END_TAG":
-                if state.in_prog_tags and prog_tag_buf.parts and state.cur_program:
-                    self._emit_prog_tag_spec(state.cur_program, prog_tag_buf.flush())
-                else:
+                if state.in_program and stripped == "TAG":
+                    state.in_prog_tags = True
                     prog_tag_buf.reset()
-                state.in_prog_tags = False
-                i += 1
-                continue
+                    i += 1
+                    continue
+                elif state.in_program and stripped == "END_TAG":
+                    if state.in_prog_tags and prog_tag_buf.parts and state.cur_program:
+                        prog_tag_stmts.append(prog_tag_buf.flush())
+                    else:
+                        prog_tag_buf.reset()
+                    self._emit_prog_tag_specs(state.cur_program, prog_tag_stmts)
+                    prog_tag_stmts.clear()
+                    state.in_prog_tags = False
+                    i += 1
+                    continue
 
-            # --- State transitions
-            if stripped.startswith("DATATYPE"):
-                # Capture the entire DATATYPE header (may span multiple lines) up to the closing ')'
-                hdr_lines = [raw.rstrip("\n")]
-                j = i + 1
+                # --- State transitions
+                if kw == "DATATYPE":
+                    # Capture the entire DATATYPE header (may span multiple lines) up to the closing ')'
+                    hdr_lines = [raw]
+                    j = i + 1
+
+                    depth = paren_delta(stripped)
+                    if depth > 0:
+                        while j < n:
+                            line_j = lines[j]
+                            hdr_lines.append(line_j)
+                            depth += paren_delta(line_j)
+                            j += 1
+                            if depth <= 0:
+                                break
+                    header_blob = " ".join(map(str.strip, hdr_lines))
+
+                    # Log unballanced parens in header for debugging (stripping the lines
+                    # changes no parens or quotes, so the blob gives the same count)
+                    if paren_delta(header_blob) != 0:
+                        self.corrected_tags_log.append(
+                            f"Unballanced parens in header starting at line {i+1}"
+                        )
 
-                depth = utils.paren_delta(stripped)
-                if depth > 0:
-                    while j < n:
-                        line_j = lines[j].rstrip("\n")
-                        hdr_lines.append(line_j)
-                        depth += utils.paren_delta(line_j)
-                        j += 1
-                        if depth <= 0:
-                            break
-                header_blob = " ".join(l.strip() for l in hdr_lines)
+                    # Name comes from the first header line
+                    name = utils.extract_block_name(stripped, header="DATATYPE")
+                    if not name:
+                        i = j
+                        continue
 
-                # Log unballanced parens in header for debugging
-                if utils.paren_delta(" ".join(hdr_lines)) != 0:
-                    self.corrected_tags_log.append(
-                        f"Unballanced parens in header starting at line {i+1}"
+                    # Description and FamilyType come from the combined header blob
+                    current_struct = UDT(
+                        name, get_desc(header_blob), self._get_family_type(header_blob) or "NoFamily"
                     )
-
-                # Name comes from the first header line
-                name = utils.extract_block_name(hdr_lines[0].strip(), header="DATATYPE")
-                if not name:
+                    udts[name] = current_struct  # type: ignore[attr-defined]
+                    # Continue parsing on the first member line after the header
                     i = j
+                    state.in_udt = True
+                    state.in_aoi = False
+                    state.in_aoi_params = False
+                    state.in_aoi_localtags = False
                     continue
-
-                current_struct = models.UDT(name)
-                # Fill description and FamilyType from the combined header blob
-                set_desc(current_struct, header_blob)
-                ft = self._get_family_type(header_blob)
-                if ft:
-                    current_struct.family_type = ft
-                # else keep default "NoFamily"
-
-                udts[name] = current_struct  # type: ignore[attr-defined]
-                # Continue parsing on the first member line after the header
-                i = j
-                state.in_udt = True
-                state.in_aoi = False
-                state.in_aoi_params = False
-                state.in_aoi_localtags = False
-                continue
-            elif stripped.startswith("END_DATATYPE"):
-                state.in_udt = False
-                current_struct = None
-                i += 1
-                continue
-            elif stripped.startswith("ADD_ON_INSTRUCTION_DEFINITION"):
-                state.in_aoi = True
-                state.in_udt = False
-                name = utils.extract_block_name(stripped, header="ADD_ON_INSTRUCTION_DEFINITION")
-                if not name:
+                elif kw == "END_DATATYPE":
+                    state.in_udt = False
+                    current_struct = None
+                    i += 1
+                    continue
+                elif kw == "ADD_ON_INSTRUCTION_DEFINITION":
+                    state.in_aoi = True
+                    state.in_udt = False
+                    name = utils.extract_block_name(stripped, header="ADD_ON_INSTRUCTION_DEFINITION")
+                    if not name:
+                        i += 1
+                        continue
+                    current_struct = AOI(name, get_desc(stripped))
+                    aois[name] = current_struct  # type: ignore[attr-defined]
+                    i += 1
+                    continue
+                elif kw == "END_ADD_ON_INSTRUCTION_DEFINITION":
+                    state.in_aoi = False
+                    current_struct = None
                     i += 1
                     continue
-                current_struct = models.AOI(name)
-                set_desc(current_struct, stripped)
-                aois[name] = current_struct  # type: ignore[attr-defined]
-                i += 1
-                continue
-            elif stripped.startswith("END_ADD_ON_INSTRUCTION_DEFINITION"):
-                state.in_aoi = False
-                current_struct = None
-                i += 1
-                continue
 
-            # --- Encoded AOI header
-            if stripped.startswith("ENCODED_DATA"):
-                meta_lines = [raw.rstrip("\n")]
-                j = i + 1
-                # collect lines until we hit a closing ')' of the metadata parens
-                while j < n:
-                    meta_lines.append(lines[j].rstrip("\n"))
-                    if ')' in lines[j]:
+                # --- Encoded AOI header
+                if kw == "ENCODED_DATA":
+                    meta_lines = [raw]
+                    j = i + 1
+                    # collect lines until we hit a closing ')' of the metadata parens
+                    while j < n:
+                        meta_lines.append(lines[j])
+                        if ')' in lines[j]:
+                            j += 1
+                            break
                         j += 1
-                        break
-                    j += 1
-                meta_blob = " ".join(l.strip() for l in meta_lines)
-                if "EncodedType := ADD_ON_INSTRUCTION_DEFINITION" in meta_blob:
-                    mname = re.search(r'Name\s*:=\s*"([^"]+)"', meta_blob)
-                    aoi_name = mname.group(1) if mname else None
-                    if aoi_name:
-                        state.in_aoi = True
-                        state.in_udt = False
-                        state.in_aoi_params = False
-                        state.in_aoi_localtags = False
-                        current_struct = models.AOI(aoi_name)
-                        # set description from meta blob if present
-                        set_desc(current_struct, meta_blob)
-                        aois[aoi_name] = current_struct  # type: ignore[attr-defined]
-                i = j
-                continue
-
-            if stripped.startswith("END_ENCODED_DATA"):
-                state.in_aoi = False
-                current_struct = None
-                i += 1
-                continue
+                    meta_blob = " ".join(map(str.strip, meta_lines))
+                    if "EncodedType := ADD_ON_INSTRUCTION_DEFINITION" in meta_blob:
+                        mname = RE_ENCODED_NAME.search(meta_blob)
+                        aoi_name = mname.group(1) if mname else None
+                        if aoi_name:
+                            state.in_aoi = True
+                            state.in_udt = False
+                            state.in_aoi_params = False
+                            state.in_aoi_localtags = False
+                            # description from meta blob if present
+                            current_struct = AOI(aoi_name, get_desc(meta_blob))
+                            aois[aoi_name] = current_struct  # type: ignore[attr-defined]
+                    i = j
+                    continue
 
-            # --- PROGRAM start/end ---
-            if stripped.startswith("PROGRAM"):
-                # Extract program name (token immediately after PROGRAM, before any attrs)
-                after_kw = raw.split("PROGRAM", 1)[1].lstrip()
-                prog_name = after_kw.split(None, 1)[0] if after_kw else ""
-                if "(" in prog_name:
-                    prog_name = prog_name.split("(", 1)[0]
-
-                desc = get_desc(raw) if prog_name else ""
-                existing = programs.get(prog_name) if prog_name else None
-                if prog_name and existing is None:
-                    programs[prog_name] = models.Program(prog_name, desc or "")
-                elif prog_name and existing and (not existing.description) and desc:
-                    existing.description = desc
-
-                state.in_program = bool(prog_name)
-                state.cur_program = prog_name or None
-                state.in_prog_tags = False
-                i += 1
-                continue
-            elif stripped.startswith("END_PROGRAM"):
-                # Flush any in-progress tag capture
-                if state.in_prog_tags and prog_tag_buf.parts and state.cur_program:
-                    self._emit_prog_tag_spec(state.cur_program, prog_tag_buf.flush())
-                else:
-                    prog_tag_buf.reset()
+                if kw == "END_ENCODED_DATA":
+                    state.in_aoi = False
+                    current_struct = None
+                    i += 1
+                    continue
 
-                state.in_program = False
-                state.cur_program = None
-                state.in_prog_tags = False
-                i += 1
-                continue
+                # --- PROGRAM start/end ---
+                if kw == "PROGRAM":
+                    # Extract program name (token immediately after PROGRAM, before any attrs)
+                    after_kw = raw.split("PROGRAM", 1)[1].lstrip()
+                    prog_name = after_kw.split(None, 1)[0] if after_kw else ""
+                    if "(" in prog_name:
+                        prog_name = prog_name.split("(", 1)[0]
+
+                    desc = get_desc(raw) if prog_name else ""
+                    existing = programs.get(prog_name) if prog_name else None
+                    if prog_name and existing is None:
+                        programs[prog_name] = models.Program(prog_name, desc or "")
+                    elif prog_name and existing and (not existing.description) and desc:
+                        existing.description = desc
+
+                    # Statements of a previous PROGRAM left without END_PROGRAM
+                    if prog_tag_stmts:
+                        self._emit_prog_tag_specs(state.cur_program, prog_tag_stmts)
+                        prog_tag_stmts.clear()
+                    state.in_program = bool(prog_name)
+                    state.cur_program = prog_name or None
+                    state.in_prog_tags = False
+                    i += 1
+                    continue
+                elif kw == "END_PROGRAM":
+                    # Flush any in-progress tag capture
+                    if state.in_prog_tags and prog_tag_buf.parts and state.cur_program:
+                        prog_tag_stmts.append(prog_tag_buf.flush())
+                    else:
+                        prog_tag_buf.reset()
+                    if prog_tag_stmts:
+                        self._emit_prog_tag_specs(state.cur_program, prog_tag_stmts)
+                        prog_tag_stmts.clear()
+
+                    state.in_program = False
+                    state.cur_program = None
+                    state.in_prog_tags = False
+                    i += 1
+                    continue
 
             # --- Tag lines within PROGRAM/TAG (incremental, multiline-safe) ---
             if state.in_program and state.in_prog_tags and state.cur_program:
-                if prog_tag_buf.feed(raw.strip()):
-                    self._emit_prog_tag_spec(state.cur_program, prog_tag_buf.flush())
+                if prog_tag_buf.feed(stripped):
+                    prog_tag_stmts.append(prog_tag_buf.flush())
                 i += 1
                 continue
 
             # --- Tag lines within CONTROLLER/TAG (incremental, multiline-safe) ---
             if state.in_controller and state.in_tags:
-                chunk = raw.strip()
-
-                if tag_buf.feed(chunk):
-                    self._emit_tag_spec(tag_buf.flush())
+                if tag_buf.feed(stripped):
+                    tag_stmts.append(tag_buf.flush())
 
                 i += 1
                 continue
 
             # --- Sub-state transitions within AOI
-            if state.in_aoi:
+            if state.in_aoi and stripped in _AOI_SECTION_MARKERS:
                 if stripped == "PARAMETERS":
                     state.in_aoi_params = True
-                    i += 1
-                    continue
                 elif stripped == "END_PARAMETERS":
                     state.in_aoi_params = False
-                    i += 1
-                    continue
                 elif stripped == "LOCAL_TAGS":
                     state.in_aoi_localtags = True
-                    i += 1
-                    continue
-                elif stripped == "END_LOCAL_TAGS":
+                else:
                     state.in_aoi_localtags = False
-                    i += 1
-                    continue
+                i += 1
+                continue
 
             # --- Data parsing
-            if state.in_udt and isinstance(current_struct, models.UDT):
+            if state.in_udt and isinstance(current_struct, UDT):
                 # Hidden SINT word (10 'Z' prefix) acts as parent for following BIT aliases
-                m = RE_UDT_TYPEFIRST.match(stripped)
+                m = udt_typefirst_match(stripped)
                 if m and m.group('dtype') == 'SINT' and m.group('name').startswith('Z' * 10):
                     name = m.group('name')
-                    definition, i_next = capture_block(i)
+                    definition, i_next = capture_block(i, stripped)
                     member = current_struct.members.get(name)
                     if member is None:
-                        member = models.UDTMember(
+                        member = UDTMember(
                             name, 'SINT',
                             description=get_desc(definition),
                             definition=definition.strip(),
@@ -499,13 +581,13 @@ class L5KParser:
                     continue
 
                 # BIT alias line: BIT Alias WordName : <bit>;
-                m = RE_UDT_BIT_ALIAS.match(stripped)
+                m = udt_bit_alias_match(stripped)
                 if m:
                     alias = m.group('alias')
                     word = m.group('word')
                     bit = int(m.group('bit'))
-                    definition, i_next = capture_block(i)
-                    child = models.UDTMember(
+                    definition, i_next = capture_block(i, stripped)
+                    child = UDTMember(
                         alias, 'BOOL',
                         description=get_desc(definition),
                         definition=definition.strip(),
@@ -516,7 +598,7 @@ class L5KParser:
                     current_struct.add_member(child)
                     parent = current_struct.members.get(word)
                     if parent is None:
-                        parent = models.UDTMember(
+                        parent = UDTMember(
                             word, 'SINT',
                             description=get_desc(definition),
                             definition=None,
@@ -528,12 +610,12 @@ class L5KParser:
                     continue
 
                 # UDT Type-first
-                m = RE_UDT_TYPEFIRST.match(stripped)
+                m = udt_typefirst_match(stripped)
                 if m:
-                    dtype, name = m.group('dtype'), m.group('name')
+                    dtype, name = intern(m.group('dtype')), m.group('name')
                     name_dims = m.group('name_dims') or ""
-                    definition, i_next = capture_block(i)
-                    current_struct.add_member(models.UDTMember(
+                    definition, i_next = capture_block(i, stripped)
+                    current_struct.add_member(UDTMember(
                             name, dtype,
                             description=get_desc(definition),
                             definition=definition.strip(),
@@ -542,14 +624,15 @@ class L5KParser:
                     i = i_next
                     continue
 
-            elif state.in_aoi_params and isinstance(current_struct, models.AOI):
-                m = RE_AOI_PARAM.match(stripped)
+            elif state.in_aoi_params and isinstance(current_struct, AOI):
+                m = aoi_param_match(stripped)
                 if m:
                     name, dtype_or_path = m.groups()
-                    definition, i_next = capture_block(i)
+                    dtype_or_path = intern(dtype_or_path)
+                    definition, i_next = capture_block(i, stripped)
                     definition = self._strip_attrs(definition)
                     current_struct.add_parameter(
-                        models.AOIParameter(
+                        AOIParameter(
                             name,
                             dtype_or_path,
                             description=get_desc(definition),
@@ -561,14 +644,15 @@ class L5KParser:
                 i += 1
                 continue
 
-            elif state.in_aoi_localtags and isinstance(current_struct, models.AOI):
-                m = RE_AOI_LOCALTAG.match(stripped)
+            elif state.in_aoi_localtags and isinstance(current_struct, AOI):
+                m = aoi_local_match(stripped)
                 if m:
                     name, dtype = m.groups()
-                    definition, i_next = capture_block(i)
+                    dtype = intern(dtype)
+                    definition, i_next = capture_block(i, stripped)
                     definition = self._strip_attrs(definition)
                     current_struct.add_localtag(
-                        models.AOILocalTag(
+                        AOILocalTag(
                             name,
                             dtype,
                             description=get_desc(definition),
@@ -583,11 +667,18 @@ class L5KParser:
             # default advance
             i += 1
 
+        # Blocks cut off by the end of the file
+        if tag_stmts:
+            self._emit_tag_specs(tag_stmts)
+        if prog_tag_stmts:
+            self._emit_prog_tag_specs(state.cur_program, prog_tag_stmts)
+
     def _resolve_nested_types(self) -> None:
         """
         Second pass: resolve AOI parameter base types for 'OF' paths.
         Only the FIRST LINE of the definition is rewritten to ': BaseType'.
         """
+        self._base_type_cache.clear()
         for aoi in getattr(self.project, "aois", {}).values():
             for param in aoi.parameters.values():
                 original_type = param.data_type
@@ -601,16 +692,16 @@ class L5KParser:
                             lines = param.definition.splitlines()
                             first = lines[0]
                             # Replace "Name OF X.Y" or "Name : T" with "Name : BaseType"
-                            first = re.sub(
-                                r'^(\s*' + re.escape(param.name) + r')\s+(?:OF\s+[\w\.]+|:\s*[\w\.]+)',
-                                r'\1 : ' + base_type,
-                                first
-                            )
+                            m = RE_AOI_PARAM_TYPE_DECL.match(first)
+                            if m and m.group(2) == param.name:
+                                first = f"{m.group(1)}{param.name} : {base_type}{first[m.end():]}"
                             lines[0] = first
                             param.definition = "\n".join(lines)
                         self.corrected_tags_log.append(
                             f'Corrected {aoi.name}.{param.name}: from "{original_type}" to "{base_type}"'
                         )
+        # Types may change before the next pass (merge, reparse)
+        self._base_type_cache.clear()
 
     def _get_header_and_body(self) -> Tuple[str, List[str]]:
         """
@@ -649,17 +740,23 @@ class L5KParser:
         Always includes the header at the top.
         """
         header_text, body_lines = self._get_header_and_body()
+        # List + join on purpose: most entries are the source line objects themselves (one pointer
+        # each), and two StringIO.write calls per line measured about twice as slow as append/join
         out: List[str] = []
         if header_text:
             out.append(header_text)
 
-        state = ExportState()
-        sel_udts = selection.get("udts", set())
+        # Block state lives in locals (not an object) since it is read on every line
+        in_udt = in_aoi = in_params = in_locals = False
+        in_controller = in_routine = in_tags = False
+        current_udt: Optional[str] = None
+        current_aoi: Optional[str] = None
+        sel_udts = selection.get("udts", _EMPTY)
         sel_udt_members = selection.get("udt_members", {})
-        sel_aois = selection.get("aois", set())
+        sel_aois = selection.get("aois", _EMPTY)
         sel_aoi_params = selection.get("aoi_parameters", {})
         sel_aoi_locals = selection.get("aoi_localtags", {})
-        sel_tags = selection.get("tags", set())
+        sel_tags = selection.get("tags", _EMPTY)
         sel_prog_tags = selection.get("program_tags", {})
 
         # Buffers for conditional inclusion (block-level)
@@ -668,6 +765,17 @@ class L5KParser:
 
         # When we inject a full multi-line AOI member definition, skip original source lines
         skip_until_block_end = False
+        leading_ws = _LEADING_WS.match
+        block_keyword = _BLOCK_KEYWORD.match
+        out_append = out.append
+        project_tags = getattr(self.project, "tags", {})
+        udt_member_should_keep = self._udt_member_should_keep
+        process_aoi_param_line = self._process_aoi_param_line
+        process_aoi_local_line = self._process_aoi_local_line
+        tag_name_match = RE_TAG_NAME.match
+        member_typefirst_match = RE_UDT_MEMBER_TYPEFIRST.match
+        member_namefirst_match = RE_UDT_MEMBER_NAMEFIRST.match
+        member_bit_alias_match = RE_UDT_BIT_ALIAS.match
 
         def flush_block(end_line: str) -> None:
             nonlocal block_lines, kept_lines
@@ -679,9 +787,11 @@ class L5KParser:
 
         i = 0
         body_len = len(body_lines)
+        # Every line is classified on its stripped text; strip them all in one C-level pass
+        stripped_lines = list(map(str.strip, body_lines))
         while i < body_len:
             line = body_lines[i]
-            s = line.strip()
+            s = stripped_lines[i]
 
             # honor skipping source lines after we've emitted a full block definition
             if skip_until_block_end:
@@ -690,20 +800,24 @@ class L5KParser:
                 i += 1
                 continue
 
+            # Block keyword opening the line, if any: one match instead of a startswith() per keyword
+            m = block_keyword(s)
+            kw = m.group() if m else None
+
             # --- Skip entire ROUTINE...END_ROUTINE blocks in export ---
-            if state.in_routine:
-                if s.startswith("END_ROUTINE"):
-                    state.in_routine = False
+            if in_routine:
+                if kw == "END_ROUTINE":
+                    in_routine = False
                 i += 1
                 continue
-            if s.startswith("ROUTINE"):
-                state.in_routine = True
+            if kw == "ROUTINE":
+                in_routine = True
                 i += 1
                 continue
 
             # ----- CONTROLLER start/end -----
-            if s.startswith("CONTROLLER"):
-                state.in_controller = True
+            if kw == "CONTROLLER":
+                in_controller = True
                 hdr = getattr(self, "controller_header_lines", None)
                 if hdr:
                     out.extend(hdr)
@@ -712,38 +826,38 @@ class L5KParser:
                     continue
                 else:
                     # fallback if header wasn't captured for some reason
-                    out.append(line)
+                    out_append(line)
                     i += 1
                     continue
-            if s.startswith("END_CONTROLLER"):
-                state.in_controller = False
-                if not state.in_routine:
+            if kw == "END_CONTROLLER":
+                in_controller = False
+                if not in_routine:
                     if "DefaultData :=" not in s:
-                        out.append(line)
+                        out_append(line)
                 i += 1
                 continue
 
             # ----- TAGS start/end -----
-            if state.in_controller and s == "TAG":
-                state.in_tags = True
+            if in_controller and s == "TAG":
+                in_tags = True
                 block_lines = [line]
                 kept_lines = []
                 i += 1
                 continue
-            if state.in_controller and s == "END_TAG":
+            if in_controller and s == "END_TAG":
                 # finish TAG block; only emit if we kept any tag lines
                 block_lines.append(line)
                 if kept_lines:
                     out.extend(block_lines)
                 block_lines = []
                 kept_lines = []
-                state.in_tags = False
+                in_tags = False
                 i += 1
                 continue
 
             # Inside TAGS: rebuild only selected tags (omit values)
-            if state.in_controller and state.in_tags:
-                mm = re.match(r'^([\w\.]+)\s*:\s*', s)
+            if in_controller and in_tags:
+                mm = tag_name_match(s)
                 if mm:
                     tag_name = mm.group(1)
                     if tag_name in sel_tags:
@@ -751,8 +865,8 @@ class L5KParser:
                         kept_lines.append("")  # just a marker
 
                         # Reconstruct a clean, value-free tag definition from the parsed model
-                        tag_obj = getattr(self.project, "tags", {}).get(tag_name)
-                        indent = line[:len(line) - len(line.lstrip())]
+                        tag_obj = project_tags.get(tag_name)
+                        indent = line[:leading_ws(line).end()]
                         if tag_obj and getattr(tag_obj, "definition", None):
                             for def_line in tag_obj.definition.splitlines():
                                 block_lines.append(indent + def_line)
@@ -767,105 +881,108 @@ class L5KParser:
                     continue
 
             # ----- UDT start/end -----
-            if s.startswith("DATATYPE"):
-                state.in_udt = True
-                m = re.search(r'^DATATYPE\s+([^\s(]+)', s)
-                state.current_udt = m.group(1) if m else None
-                udt_obj = self.project.udts.get(state.current_udt) if state.current_udt else None
+            if kw == "DATATYPE":
+                in_udt = True
+                m = RE_DATATYPE_NAME.match(s)
+                current_udt = m.group(1) if m else None
+                udt_obj = self.project.udts.get(current_udt) if current_udt else None
                 header_line = self._render_udt_header_line(udt_obj) if udt_obj else line
                 block_lines = [header_line]
                 kept_lines = []
                 i += 1
                 continue
-            if s.startswith("END_DATATYPE"):
+            if kw == "END_DATATYPE":
                 flush_block(line)
-                state.in_udt = False
-                state.current_udt = None
+                in_udt = False
+                current_udt = None
                 i += 1
                 continue
 
             # ----- AOI start/end -----
-            if s.startswith("ADD_ON_INSTRUCTION_DEFINITION"):
-                state.in_aoi = True
-                m = re.search(r'^ADD_ON_INSTRUCTION_DEFINITION\s+([^\s(]+)', s)
-                state.current_aoi = m.group(1) if m else None
-                state.in_params = False
-                state.in_locals = False
+            if kw == "ADD_ON_INSTRUCTION_DEFINITION":
+                in_aoi = True
+                m = RE_AOI_DEF_NAME.match(s)
+                current_aoi = m.group(1) if m else None
+                in_params = False
+                in_locals = False
                 block_lines = [line]
                 kept_lines = []
                 i += 1
                 continue
-            if s.startswith("END_ADD_ON_INSTRUCTION_DEFINITION"):
+            if kw == "END_ADD_ON_INSTRUCTION_DEFINITION":
                 flush_block(line)
-                state.in_aoi = False
-                state.current_aoi = None
-                state.in_params = False
-                state.in_locals = False
+                in_aoi = False
+                current_aoi = None
+                in_params = False
+                in_locals = False
                 i += 1
                 continue
 
             # ----- AOI start (ENCODED_DATA) -----
-            if s.startswith("ENCODED_DATA"):
+            if kw == "ENCODED_DATA":
                 # gather metadata block to extract name
                 meta_lines = [line]
                 j = i + 1
-                body_len_inner = len(body_lines)
-                while j < body_len_inner:
+                while j < body_len:
                     meta_line = body_lines[j]
                     meta_lines.append(meta_line)
                     if ')' in meta_line:
                         j += 1
                         break
                     j += 1
-                meta_blob = " ".join(l.strip() for l in meta_lines)
+                meta_blob = " ".join(stripped_lines[i:j])
                 aoi_name = None
                 if "EncodedType := ADD_ON_INSTRUCTION_DEFINITION" in meta_blob:
-                    mname = re.search(r'Name\s*:=\s*"([^"]+)"', meta_blob)
+                    mname = RE_ENCODED_NAME.search(meta_blob)
                     aoi_name = mname.group(1) if mname else None
 
-                state.in_aoi = True
-                state.current_aoi = aoi_name
-                state.in_params = False
-                state.in_locals = False
+                in_aoi = True
+                current_aoi = aoi_name
+                in_params = False
+                in_locals = False
                 block_lines = meta_lines[:]  # include the metadata lines as part of the AOI block
                 kept_lines = []
                 i = j
                 continue
 
             # ----- AOI end (ENCODED_DATA) -----
-            if s.startswith("END_ENCODED_DATA"):
+            if kw == "END_ENCODED_DATA":
                 flush_block(line)
-                state.in_aoi = False
-                state.current_aoi = None
-                state.in_params = False
-                state.in_locals = False
+                in_aoi = False
+                current_aoi = None
+                in_params = False
+                in_locals = False
                 i += 1
                 continue
 
             # ----- Within UDT -----
-            if state.in_udt and state.current_udt:
+            if in_udt and current_udt:
                 # Detect UDT member name on this line
                 member_name: Optional[str] = None
-                # Type-first
-                m = re.match(r'^(?P<dtype>\w+(?:\[\d+(?:,\d+)*\])?)\s+(?P<name>\w+)\b', s)
-                if m:
-                    member_name = m.group('name')
-                # Name-first
-                if member_name is None:
-                    m = re.match(r'^(?P<name>\w+)\s*:\s*(?P<dtype>[\w\[\]\.]+);?', s)
+                # All three forms start with a word character (\w is isalnum() or '_');
+                # continuation and comment lines never reach the regexes
+                c0 = s[:1]
+                if c0 == '_' or c0.isalnum():
+                    # Type-first
+                    m = member_typefirst_match(s)
                     if m:
                         member_name = m.group('name')
-                # BIT alias
-                if member_name is None:
-                    m = re.match(r'^BIT\s+(?P<alias>\w+)\s+(?P<word>\w+)\s*:\s*(?P<bit>\d+)\b', s)
-                    if m:
-                        member_name = m.group('alias')
+                    # Name-first (needs the ':')
+                    if member_name is None and ':' in s:
+                        m = member_namefirst_match(s)
+                        if m:
+                            member_name = m.group('name')
+                    # BIT alias
+                    if member_name is None and s.startswith("BIT"):
+                        m = member_bit_alias_match(s)
+                        if m:
+                            member_name = m.group('alias')
 
                 if member_name is not None:
-                    udt_selected = state.current_udt in sel_udts
-                    members_sel = sel_udt_members.get(state.current_udt, set())
+                    udt_selected = current_udt in sel_udts
+                    members_sel = sel_udt_members.get(current_udt, _EMPTY)
                     keep_line = False
-                    if udt_selected or self._udt_member_should_keep(state.current_udt, member_name, members_sel):
+                    if udt_selected or udt_member_should_keep(current_udt, member_name, members_sel):
                         keep_line = True
 
                     if keep_line:
@@ -876,45 +993,37 @@ class L5KParser:
                 continue
 
             # ----- Within AOI -----
-            if state.in_aoi and state.current_aoi:
-                # Track section state
-                if s == "PARAMETERS":
-                    state.in_params = True
-                    state.in_locals = False
-                    block_lines.append(line)
-                    i += 1
-                    continue
-                elif s == "END_PARAMETERS":
-                    state.in_params = False
-                    block_lines.append(line)
-                    i += 1
-                    continue
-                elif s == "LOCAL_TAGS":
-                    state.in_locals = True
-                    state.in_params = False
-                    block_lines.append(line)
-                    i += 1
-                    continue
-                elif s == "END_LOCAL_TAGS":
-                    state.in_locals = False
+            if in_aoi and current_aoi:
+                # Track section state (one set lookup rejects ordinary member lines)
+                if s in _AOI_SECTION_MARKERS:
+                    if s == "PARAMETERS":
+                        in_params = True
+                        in_locals = False
+                    elif s == "END_PARAMETERS":
+                        in_params = False
+                    elif s == "LOCAL_TAGS":
+                        in_locals = True
+                        in_params = False
+                    else:
+                        in_locals = False
                     block_lines.append(line)
                     i += 1
                     continue
 
-                aoi_selected = state.current_aoi in sel_aois
+                aoi_selected = current_aoi in sel_aois
                 keep_this_line = False
 
-                if state.in_params:
-                    handled, keep_this_line, skip_until_block_end = self._process_aoi_param_line(
-                        state.current_aoi, s, sel_aoi_params, kept_lines, block_lines
+                if in_params:
+                    handled, keep_this_line, skip_until_block_end = process_aoi_param_line(
+                        current_aoi, s, sel_aoi_params, kept_lines, block_lines
                     )
                     if handled and skip_until_block_end:
                         i += 1
                         continue
 
-                elif state.in_locals:
-                    handled, keep_this_line, skip_until_block_end = self._process_aoi_local_line(
-                        state.current_aoi, s, sel_aoi_locals, kept_lines, block_lines
+                elif in_locals:
+                    handled, keep_this_line, skip_until_block_end = process_aoi_local_line(
+                        current_aoi, s, sel_aoi_locals, kept_lines, block_lines
                     )
                     if handled and skip_until_block_end:
                         i += 1
@@ -928,9 +1037,9 @@ class L5KParser:
                 continue
 
             # ----- Outside any block -----
-            if not state.in_routine:
+            if not in_routine:
                 if "DefaultData :=" not in s:
-                    out.append(line)
+                    out_append(line)
             i += 1
 
         return "\n".join(out)
@@ -938,6 +1047,12 @@ class L5KParser:
     def export_whitelist(self, selection: SelectionDict) -> str:
         return exporter.export_whitelist(self, selection)
 
+    def export_whitelist_to_file(self, selection: SelectionDict, fp) -> None:
+        exporter.export_whitelist_to_file(self, selection, fp)
+
+    def export_whitelist_to_binary(self, selection: SelectionDict, fp, encoding: str = "utf-8") -> None:
+        exporter.export_whitelist_to_binary(self, selection, fp, encoding)
+
     def _parse_tag_fields(self, buf: str, strip_paren_from_dtype: bool = False) -> Optional[tuple[str, str, str, str]]:
         """
         Shared parser for controller/program TAG statements.
@@ -962,6 +1077,8 @@ class L5KParser:
         dtype = (m.group(3) or "").strip()
         if strip_paren_from_dtype and '(' in dtype:
             dtype = dtype.split('(', 1)[0].strip()
+        # A handful of type names repeat across thousands of tags; share one string each
+        dtype = sys.intern(dtype)
 
         desc = get_desc(attrs) if attrs else ""
 
@@ -973,36 +1090,32 @@ class L5KParser:
 
         return name, dtype, desc, definition
 
-    def _emit_tag_spec(self, buf: str) -> None:
-        """Parse a controller TAG statement (ignores := values and force data)."""
-        fields = self._parse_tag_fields(buf, strip_paren_from_dtype=False)
-        if not fields:
-            return
-        name, dtype, desc, definition = fields
-
-        self.project.tags[name] = models.Tag(
-            name=name,
-            data_type=dtype,
-            description=desc,
-            definition=definition
-        )
+    def _emit_tag_specs(self, bufs: List[str]) -> None:
+        """Parse controller TAG statements, in order (ignores := values and force data)."""
+        parse_fields = self._parse_tag_fields
+        tags = self.project.tags
+        Tag = models.Tag
+        for buf in bufs:
+            fields = parse_fields(buf, False)
+            if not fields:
+                continue
+            name, dtype, desc, definition = fields
+            tags[name] = Tag(name, dtype, desc, definition)
 
-    def _emit_prog_tag_spec(self, prog: Optional[str], buf: str) -> None:
-        """Parse a PROGRAM TAG statement and attach it to the owning Program."""
+    def _emit_prog_tag_specs(self, prog: Optional[str], bufs: List[str]) -> None:
+        """Parse PROGRAM TAG statements, in order, and attach them to the owning Program."""
         if not prog or prog not in getattr(self.project, "programs", {}):
             return
 
-        fields = self._parse_tag_fields(buf, strip_paren_from_dtype=True)
-        if not fields:
-            return
-        name, dtype, desc, definition = fields
-
-        self.project.programs[prog].tags[name] = models.Tag(
-            name=name,
-            data_type=dtype,
-            description=desc,
-            definition=definition,
-        )
+        parse_fields = self._parse_tag_fields
+        tags = self.project.programs[prog].tags
+        Tag = models.Tag
+        for buf in bufs:
+            fields = parse_fields(buf, True)
+            if not fields:
+                continue
+            name, dtype, desc, definition = fields
+            tags[name] = Tag(name, dtype, desc, definition)
 
     # ---------- Helpers ----------
     @staticmethod
@@ -1020,18 +1133,15 @@ class L5KParser:
           'DATATYPE  DateTime (Description := "...")'
           'ADD_ON_INSTRUCTION_DEFINITION  MyAOI (Version := 1.0)'
         """
-        m = re.search(r'^' + re.escape(header) + r'\s+([^\s(]+)', header_line)
-        return m.group(1) if m else None
+        return utils.extract_block_name(header_line, header)
 
     @staticmethod
     def _match_aoi_param_name(stripped_line: str) -> Optional[str]:
-        m = re.match(r'^([\w]+)\s+(?:OF|:)\s+([\w\.]+)', stripped_line)
-        return m.group(1) if m else None
+        return utils.match_aoi_param_name(stripped_line)
 
     @staticmethod
     def _match_aoi_local_name(stripped_line: str) -> Optional[str]:
-        m = re.match(r'^([\w]+)\s*:\s*([\w]+)', stripped_line)
-        return m.group(1) if m else None
+        return utils.match_aoi_local_name(stripped_line)
 
     def _encode_l5k_string(self, s: str) -> str:
         """
@@ -1089,8 +1199,9 @@ class L5KParser:
         - Also accept styles where the '(' begins on the next line.
         Returns (header_lines, next_index_after_header, controller_name).
         """
+        # Callers pass self.lines (splitlines() output), so lines carry no "\n" to trim
         n = len(lines)
-        first = lines[i].rstrip("\n")
+        first = lines[i]
         header = [first]
 
         # Name + whether '(' started on this line
@@ -1103,13 +1214,13 @@ class L5KParser:
 
         # If no '(' on the first line, but the very next line starts an attribute list, include it
         if depth == 0 and j < n and lines[j].lstrip().startswith("("):
-            header.append(lines[j].rstrip("\n"))
+            header.append(lines[j])
             depth += utils.paren_delta(lines[j])
             j += 1
 
         # If attribute list started, include lines until depth returns to zero
         while j < n and depth > 0:
-            header.append(lines[j].rstrip("\n"))
+            header.append(lines[j])
             depth += utils.paren_delta(lines[j])
             j += 1
 
@@ -1134,6 +1245,17 @@ class L5KParser:
         if '.' not in path:
             return path
 
+        # Parameters of many AOIs resolve through the same (path, AOI) pairs; memoized
+        # for the duration of one _resolve_nested_types pass
+        key = (path, context_aoi.name)
+        cache = self._base_type_cache
+        base = cache.get(key)
+        if base is None:
+            base = cache[key] = self._walk_base_type(path, context_aoi)
+        return base
+
+    def _walk_base_type(self, path: str, context_aoi) -> str:
+        """Uncached body of _find_base_type for a dotted `path`."""
         root_name, member_name = path.split('.', 1)
 
         if root_name in context_aoi.localtags and member_name.isdigit():
@@ -1177,7 +1299,7 @@ class L5KParser:
         if name is None:
             return False, False, False
 
-        params_sel = params_sel_map.get(aoi_name, set())
+        params_sel = params_sel_map.get(aoi_name, _EMPTY)
         keep_this_line = name in params_sel
 
         aoi_obj = self.project.aois.get(aoi_name) if hasattr(self.project, "aois") else None
@@ -1199,7 +1321,7 @@ class L5KParser:
         if name is None:
             return False, False, False
 
-        locals_sel = locals_sel_map.get(aoi_name, set())
+        locals_sel = locals_sel_map.get(aoi_name, _EMPTY)
         keep_this_line = name in locals_sel
         aoi_obj = self.project.aois.get(aoi_name) if hasattr(self.project, "aois") else None
         local_obj = aoi_obj.localtags.get(name) if aoi_obj else None
@@ -1253,34 +1375,48 @@ class L5KParser:
     def _render_program_header_line(self, program: models.Program, indent: str = "\t") -> str:
         """
         Emit a PROGRAM header line, including Description when present.
+        The line is cached on the program and reused while name/description/indent are unchanged.
         """
-        desc = getattr(program, "description", "")
-        if isinstance(desc, str) and desc.strip():
+        name = program.name
+        desc = program.description
+        cached = program._header_cache
+        if cached is not None and cached[0] == name and cached[1] == desc and cached[2] == indent:
+            return cached[3]
+        if desc and not desc.isspace():
             enc = self._encode_l5k_string(desc)
-            return f'{indent}PROGRAM {program.name} (Description := "{enc}")'
-        return f"{indent}PROGRAM {program.name}"
+            line = f'{indent}PROGRAM {name} (Description := "{enc}")'
+        else:
+            line = f"{indent}PROGRAM {name}"
+        program._header_cache = (name, desc, indent, line)
+        return line
 
     def _ensure_header_for_export(self) -> None:
         """
         Make sure self.header_text is populated before export.
         Prefer the already-parsed project.header; if missing, rescan the file.
+        Afterwards self.header_text is always a str (empty when the file has no header).
         """
-        if getattr(self, "header_text", ""):
+        if self.header_text:
             return
-        hdr = getattr(self.project, "header", None)
-        if hdr is not None and getattr(hdr, "content", None):
+        hdr = self.project.header
+        if hdr is not None and hdr.content:
             self.header_text = hdr.content  # keep a string on the parser
             return
         # last resort: parse the header from self.lines
         self._parse_header()
+        if self.header_text is None:
+            self.header_text = ""
 
     def _ensure_controller_header(self) -> None:
         """
         Ensure controller header lines (CONTROLLER ... [attrs]) are available on the parser.
         If they weren’t captured during parse (e.g. different instance), capture them now.
+        Afterwards self.controller_header_lines is always a list (empty if no CONTROLLER line exists).
         """
-        if getattr(self, "controller_header_lines", None):
+        if self.controller_header_lines:
             return
+        if self.controller_header_lines is None:
+            self.controller_header_lines = []
         # find first CONTROLLER and capture its header block
         for idx, ln in enumerate(self.lines):
             if ln.strip().startswith("CONTROLLER"):
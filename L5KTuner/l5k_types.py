@@ -6,7 +6,7 @@
 
 
 from __future__ import annotations
-from typing import Set, Dict, TypedDict
+from typing import Set, Dict, Iterable, Protocol, TypedDict
 
 
 class SelectionDict(TypedDict, total=False):
@@ -17,3 +17,9 @@ class SelectionDict(TypedDict, total=False):
     aoi_localtags: Dict[str, Set[str]]
     tags: Set[str]
     program_tags: Dict[str, Set[str]]
+
+
+class LineSink(Protocol):
+    """Anything export lines can be emitted into (a list, or the exporter's streaming writers)."""
+    def append(self, line: str, /) -> None: ...
+    def extend(self, lines: Iterable[str], /) -> None: ...
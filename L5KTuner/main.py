@@ -7,6 +7,7 @@
 
 import sys
 import pathlib
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk
 
@@ -43,4 +44,6 @@ def main():
     root.mainloop()
 
 if __name__ == '__main__':
+    # Required for the parse worker process in the frozen (PyInstaller) build
+    multiprocessing.freeze_support()
     main()
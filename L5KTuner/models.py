@@ -12,6 +12,8 @@ from enum import Enum, auto
 from dataclasses import dataclass, field
 import re
 
+from .l5k_types import LineSink
+
 _RE_PARAM_HDR = re.compile(
     r'^\s*(?P<name>\w+)\s+(?P<cat>OF|:)\s+(?P<rhs>[\w\.\:]+)\s*\((?P<attrs>.*)\)\s*;?\s*$',
     re.DOTALL
@@ -65,33 +67,55 @@ class L5KProject:
 
 class UDT:
     """Represents a user-defined type with members."""
-    def __init__(self, name: str, description: Optional[str] = None) -> None:
+    __slots__ = ("name", "description", "family_type", "members", "_visible")
+
+    def __init__(self, name: str, description: Optional[str] = None, family_type: str = "NoFamily") -> None:
         self.name = name
         self.description = description or ""
-        self.family_type: str = "NoFamily"
+        self.family_type: str = family_type
         self.members: Dict[str, UDTMember] = OrderedDict()
+        self._visible: Optional[List[UDTMember]] = None  # see visible_members()
 
     def add_member(self, member: UDTMember) -> None:
         self.members[member.name] = member
+        self._visible = None
+
+    def remove_member(self, name: str) -> Optional[UDTMember]:
+        self._visible = None
+        return self.members.pop(name, None)
+
+    def visible_members(self) -> List[UDTMember]:
+        """
+        Members listed directly under the UDT (BIT aliases sit under their hidden word instead).
+        Cached until add_member/remove_member change the members.
+        """
+        visible = self._visible
+        if visible is None:
+            visible = self._visible = [m for m in self.members.values() if not m.parent_word]
+        return visible
 
     def to_l5k(self, indent: str = TAB) -> List[str]:
+        lines: List[str] = []
+        self.to_l5k_into(lines, indent)
+        return lines
+
+    def to_l5k_into(self, out: LineSink, indent: str = TAB) -> None:
+        """Append the DATATYPE block to `out` (members write straight into the same list)."""
         attrs = []
         if getattr(self, "description", ""):
             attrs.append(f'Description := "{self.description}"')
         ft = getattr(self, "family_type", None) or "NoFamily"
         attrs.append(f"FamilyType := {ft}")
-        header = f"{indent}DATATYPE {self.name} ({', '.join(attrs)})"
-        lines: List[str] = [header]
+        out.append(f"{indent}DATATYPE {self.name} ({', '.join(attrs)})")
         for m in self.members.values():
-            lines.extend(m.to_l5k(level=2, indent=indent))
-        lines.append(f"{indent}END_DATATYPE")
-        return lines
+            m.to_l5k_into(out, level=2, indent=indent)
+        out.append(f"{indent}END_DATATYPE")
 
     def __repr__(self) -> str:
         return f"UDT(name={self.name!r}, members={len(self.members)})"
 
 
-@dataclass
+@dataclass(slots=True)
 class UDTMember:
     """Represents a member within a UDT; supports hidden SINT word and BIT children nesting."""
     name: str
@@ -104,6 +128,8 @@ class UDTMember:
     bit_index: Optional[int] = None
     name_dims: str = ""
     children: Dict[str, "UDTMember"] = field(default_factory=OrderedDict)
+    # "name : data_type" tree label, built on first use (see display_label)
+    _label: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def add_child(self, child: 'UDTMember') -> None:
         self.children[child.name] = child
@@ -112,12 +138,24 @@ class UDTMember:
         """Base name plus any array declarator captured on the name"""
         return f"{self.name}{self.name_dims}"
 
+    def display_label(self) -> str:
+        """Tree label "name : data_type"; built once, after the parser has settled both fields."""
+        label = self._label
+        if label is None:
+            label = self._label = f"{self.name}{self.name_dims} : {self.data_type}"
+        return label
+
     def to_l5k(self, level: int = 1, indent: str = TAB) -> List[str]:
+        lines: List[str] = []
+        self.to_l5k_into(lines, level, indent)
+        return lines
+
+    def to_l5k_into(self, out: LineSink, level: int = 1, indent: str = TAB) -> None:
         if self.definition:
-            return _indent_lines(_dedent_lines(self.definition), level, indent)
+            _indent_lines_into(out, _dedent_lines(self.definition), level, indent)
+            return
         # fallback (type-first)
-        line = f"{self.data_type} {self.name};"
-        return _indent_lines([line], level, indent)
+        _indent_lines_into(out, (f"{self.data_type} {self.name};",), level, indent)
 
     def __repr__(self) -> str:
         return f"UDTMember(name={self.name!r}, data_type={self.data_type!r})"
@@ -125,9 +163,11 @@ class UDTMember:
 
 class AOI:
     """Represents an Add-On Instruction (AOI)."""
+    __slots__ = ("name", "description", "parameters", "localtags")
+
     def __init__(self, name: str, description: Optional[str] = None) -> None:
         self.name = name
-        self.description = description or ""
+        self.description: str = description or ""
         self.parameters: Dict[str, AOIParameter] = OrderedDict()
         self.localtags: Dict[str, AOILocalTag] = OrderedDict()
 
@@ -143,13 +183,13 @@ class AOI:
         if getattr(self, "parameters", {}):
             lines.append(f"{indent}PARAMETERS")
             for p in self.parameters.values():
-                lines.extend(p.to_l5k(level=2, indent=indent))
+                p.to_l5k_into(lines, level=2, indent=indent)
             lines.append(f"{indent}END_PARAMETERS")
         # LOCAL_TAGS (Edge likes it non-empty; we can pad)
         lines.append(f"{indent}LOCAL_TAGS")
         locals_emitted = 0
         for t in getattr(self, "localtags", {}).values():
-            lines.extend(t.to_l5k(level=2, indent=indent))
+            t.to_l5k_into(lines, level=2, indent=indent)
             locals_emitted += 1
         if ensure_local_placeholder and locals_emitted == 0:
             lines.append(f'{indent*2}__EdgePad : BOOL (Description := "Edge placeholder");')
@@ -161,7 +201,7 @@ class AOI:
         return f"AOI(name={self.name!r}, params={len(self.parameters)}, locals={len(self.localtags)})"
 
 
-@dataclass
+@dataclass(slots=True)
 class AOIParameter:
     """Represents an AOI parameter; stores full definition for export and correction status."""
     name: str
@@ -170,8 +210,16 @@ class AOIParameter:
     definition: Optional[str] = None
     is_bit_alias: bool = False
     is_corrected: bool = False  # True if OF path was resolved to a base type
+    _label: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def display_label(self) -> str:
+        """Cached "name : data_type" label (see UDTMember.display_label)."""
+        label = self._label
+        if label is None:
+            label = self._label = f"{self.name} : {self.data_type}"
+        return label
 
-    def _emit_plain_bool(self, level: int, indent: str) -> List[str]:
+    def _emit_plain_bool(self, out: LineSink, level: int, indent: str) -> None:
         # Try to salvage attributes from captured definition
         attrs = ""
         if self.definition:
@@ -179,69 +227,104 @@ class AOIParameter:
             if m:
                 attrs = m.group("attrs") or ""
         body = _dedent_lines(attrs)
-        out: List[str] = []
-        out.append(f"{indent*level}{self.name} : BOOL (")
+        pref = indent * level
+        inner = pref + indent
+        out.append(f"{pref}{self.name} : BOOL (")
         for a in body:
             if a:
-                out.append(f"{indent*(level+1)}{a.rstrip()}")
-        out.append(f"{indent*level});")
-        return out
+                out.append(f"{inner}{a.rstrip()}")
+        out.append(f"{pref});")
 
     def to_l5k(self, level: int = 2, indent: str = TAB) -> List[str]:
+        lines: List[str] = []
+        self.to_l5k_into(lines, level, indent)
+        return lines
+
+    def to_l5k_into(self, out: LineSink, level: int = 2, indent: str = TAB) -> None:
         if getattr(self, "is_bit_alias", False):
-            return self._emit_plain_bool(level, indent)
-        if self.definition:
-            return _indent_lines(_dedent_lines(self.definition), level, indent)
-        # fallback minimal
-        return _indent_lines([f"{self.name} : {self.data_type} ();"], level, indent)
+            self._emit_plain_bool(out, level, indent)
+        elif self.definition:
+            _indent_lines_into(out, _dedent_lines(self.definition), level, indent)
+        else:
+            # fallback minimal
+            _indent_lines_into(out, (f"{self.name} : {self.data_type} ();",), level, indent)
 
     def __repr__(self) -> str:
         return f"AOIParameter(name={self.name!r}, data_type={self.data_type!r})"
 
 
-@dataclass
+@dataclass(slots=True)
 class AOILocalTag:
     """Represents an AOI local tag; stores full definition for export."""
     name: str
     data_type: str
     description: str = ""
     definition: Optional[str] = None
+    _label: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def display_label(self) -> str:
+        """Cached "name : data_type" label (see UDTMember.display_label)."""
+        label = self._label
+        if label is None:
+            label = self._label = f"{self.name} : {self.data_type}"
+        return label
 
     def to_l5k(self, level: int = 2, indent: str = TAB) -> List[str]:
+        lines: List[str] = []
+        self.to_l5k_into(lines, level, indent)
+        return lines
+
+    def to_l5k_into(self, out: LineSink, level: int = 2, indent: str = TAB) -> None:
         if self.definition:
-            return _indent_lines(_dedent_lines(self.definition), level, indent)
-        return _indent_lines([f"{self.name} : {self.data_type} ();"], level, indent)
+            _indent_lines_into(out, _dedent_lines(self.definition), level, indent)
+        else:
+            _indent_lines_into(out, (f"{self.name} : {self.data_type} ();",), level, indent)
 
     def __repr__(self) -> str:
         return f"AOILocalTag(name={self.name!r}, data_type={self.data_type!r})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Tag:
     """Represents a single global tag (CONTROLLER/TAG)."""
     name: str
     data_type: str
     description: str = ""
     definition: Optional[str] = None  # full line as-is
+    _label: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def display_label(self) -> str:
+        """Cached "name : data_type" label (see UDTMember.display_label)."""
+        label = self._label
+        if label is None:
+            label = self._label = f"{self.name} : {self.data_type}"
+        return label
 
     def to_l5k(self, level: int = 1, indent: str = TAB) -> List[str]:
+        lines: List[str] = []
+        self.to_l5k_into(lines, level, indent)
+        return lines
+
+    def to_l5k_into(self, out: LineSink, level: int = 1, indent: str = TAB) -> None:
         # Export w/o values; keep description if present
         desc = getattr(self, "description", "")
         if desc:
             line = f'{self.name} : {self.data_type} (Description := "{desc}");'
         else:
             line = f"{self.name} : {self.data_type};"
-        return _indent_lines([line], level, indent)
+        out.append(f"{indent * level}{line.rstrip()}")
     
     def __repr__(self) -> str:
         return f"Tag(name={self.name!r}, data_type={self.data_type!r}, description={self.description!r})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Program:
     name: str
     description: str = ""
     tags: Dict[str, Tag] = field(default_factory=dict)
+    # (name, description, indent, line) of the last rendered PROGRAM header; see L5KParser
+    _header_cache: Optional[tuple[str, str, str, str]] = field(default=None, init=False, repr=False, compare=False)
 
     def display_name(self) -> str:
         return self.name
@@ -257,3 +340,8 @@ def _dedent_lines(def_text: str) -> List[str]:
 def _indent_lines(lines: Iterable[str], level: int = 0, indent: str = TAB) -> List[str]:
     pref = indent * level
     return [f"{pref}{ln.rstrip()}" for ln in lines]
+
+def _indent_lines_into(out: LineSink, lines: Iterable[str], level: int = 0, indent: str = TAB) -> None:
+    # Same as _indent_lines, but appends to the caller's list instead of building a new one
+    pref = indent * level
+    out.extend(f"{pref}{ln.rstrip()}" for ln in lines)
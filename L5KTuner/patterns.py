@@ -7,6 +7,10 @@
 
 import re
 
+# DATATYPE / ADD_ON_INSTRUCTION_DEFINITION header: name up to whitespace or '('
+RE_DATATYPE_NAME = re.compile(r'^DATATYPE\s+([^\s(]+)')
+RE_AOI_DEF_NAME = re.compile(r'^ADD_ON_INSTRUCTION_DEFINITION\s+([^\s(]+)')
+
 # CONTROLLER <name> [ ( ...attrs... ) ]
 RE_CONTROLLER_HDR = re.compile(
     r'^CONTROLLER\s+([A-Za-z_]\w*)\s*(\(|$)'
@@ -21,6 +25,9 @@ RE_UDT_TYPEFIRST = re.compile(
 RE_UDT_BIT_ALIAS = re.compile(
     r'^BIT\s+(?P<alias>\w+)\s+(?P<word>\w+)\s*:\s*(?P<bit>\d+)\b'
 )
+# UDT member lines as recognised by the source-preserving export (get_selected_content)
+RE_UDT_MEMBER_TYPEFIRST = re.compile(r'^(?P<dtype>\w+(?:\[\d+(?:,\d+)*\])?)\s+(?P<name>\w+)\b')
+RE_UDT_MEMBER_NAMEFIRST = re.compile(r'^(?P<name>\w+)\s*:\s*(?P<dtype>[\w\[\]\.]+);?')
 RE_FAMILYTYPE = re.compile(r'\bFamilyType\s*:=\s*([A-Za-z_]\w*)', re.IGNORECASE)
 
 RE_AOI_PARAM_DEF = re.compile(
@@ -28,7 +35,14 @@ RE_AOI_PARAM_DEF = re.compile(
     re.DOTALL
 )
 RE_AOI_PARAM = re.compile(r'^([\w]+)\s+(?:OF|:)\s+([\w\.]+)')
+# "<indent><name> OF X.Y" / "<indent><name> : T" at the start of a parameter definition
+RE_AOI_PARAM_TYPE_DECL = re.compile(r'^(\s*)(\w+)\s+(?:OF\s+[\w\.]+|:\s*[\w\.]+)')
 RE_AOI_LOCALTAG = re.compile(r'^([\w]+)\s*:\s*([\w]+)')
+# Name := "..." inside an ENCODED_DATA (encoded AOI) header
+RE_ENCODED_NAME = re.compile(r'Name\s*:=\s*"([^"]+)"')
+
+# "<name> :" at the start of a TAG statement
+RE_TAG_NAME = re.compile(r'^([\w\.]+)\s*:\s*')
 
 # Tag prefix: <name> [OF alias] : <type...>  (DOTALL so we don't need to normalize newlines)
 RE_TAG_PREFIX = re.compile(
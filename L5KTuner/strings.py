@@ -100,6 +100,16 @@ def split_outer_attrs(left: str) -> tuple[str, str]:
     return left, ""
 
 
+# Single-pass L5K escape table ($ is the escape character, so it maps to $$ like the rest)
+_L5K_ESCAPE_TABLE = str.maketrans({
+    "$": "$$",
+    '"': '$"',
+    "'": "$'",
+    "\r": "$R",
+    "\n": "$N",
+})
+
+
 def encode_l5k_string(s: str) -> str:
     """
     Encode a Python string as an L5K string literal:
@@ -110,11 +120,7 @@ def encode_l5k_string(s: str) -> str:
     if not isinstance(s, str):
         return ""
 
-    out = s.replace("$", "$$")
-    out = out.replace('"', '$"').replace("'", "$'")
-    out = out.replace("\r", "$R").replace("\n", "$N")
-
-    return out
+    return s.translate(_L5K_ESCAPE_TABLE)
 
 
 def dedent_lines(def_text: str) -> list[str]:
@@ -127,8 +133,38 @@ def dedent_lines(def_text: str) -> list[str]:
     return textwrap.dedent(def_text).strip("\n").splitlines()
 
 
+def dedent_join(lines: list[str]) -> str:
+    """
+    "\n".join(lines) with common leading whitespace removed, the same result as
+    textwrap.dedent("\n".join(lines)).strip("\n") for lines without embedded newlines.
+    The margin is taken from the list directly, so the text is joined only once.
+    """
+    margin: str | None = None
+    for line in lines:
+        content = line.lstrip(" \t")
+        if not content:
+            continue
+        indent = line[:len(line) - len(content)]
+        if margin is None or margin.startswith(indent):
+            margin = indent
+        elif not indent.startswith(margin):
+            k = 0
+            for a, b in zip(margin, indent):
+                if a != b:
+                    break
+                k += 1
+            margin = margin[:k]
+    cut = len(margin) if margin else 0
+    return "\n".join(
+        line[cut:] if line.lstrip(" \t") else "" for line in lines
+    ).strip("\n")
+
+
 def get_desc(text: str) -> str:
     """Extract Description := \"...\" from a text blob."""
+    # No quote, no quoted description: skip the regex for the common attribute-only lines
+    if '"' not in text:
+        return ""
     m = RE_DESC.search(text)
     return m.group(1) if m else ""
 
@@ -5,64 +5,261 @@
 """Tree metadata and checkbox state management used by the GUI."""
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Optional, Any
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import AbstractSet, Dict, Iterator, KeysView, List, Optional, Any, Set
 
 from .models import MemberType
 
+_HASH_MASK = (1 << 64) - 1
 
-@dataclass
+
+@dataclass(slots=True)
 class TreeNodeMeta:
     """Metadata for a tree item: logical type/name and optional parent key."""
     node_type: MemberType
     name: str
     parent: Optional[str] = None
+    # (node_type name, name, parent), built once; the fields are not changed after creation
+    key: tuple[str, str, Optional[str]] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.key = (self.node_type.name, self.name, self.parent)
 
 
 class TreeState:
     """
     Wrapper for tree metadata and checkbox states so we don't juggle parallel dicts.
+
+    Also holds the full node hierarchy (children/parents/labels). The Treeview only
+    receives the nodes under expanded parents, so this hierarchy, not the widget, is
+    the source of truth for propagation, counts and filtering.
     """
     def __init__(self) -> None:
         self.meta: Dict[str, TreeNodeMeta] = {}
         self.checks: Dict[str, bool] = {}
+        # Checked iids per node type, kept in step with `checks`
+        self.checked_by_type: Dict[MemberType, Set[str]] = {}
         self._key_index: Dict[tuple[str, str, Optional[str]], str] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.parents: Dict[str, str] = {}
+        self.labels: Dict[str, str] = {}
+        self.materialized: Set[str] = set()  # parents whose children are inserted in the Treeview
+        # Subtrees known to be entirely in one state (root iid -> state), recorded by
+        # set_subtree_checked and dropped along the ancestor chain on any later change
+        self._uniform: Dict[str, bool] = {}
+        # Iids whose state changed inside the innermost batch() block, if any
+        self._changed: Optional[Set[str]] = None
+        self._next_id = 0
+        # Order-independent hash of the serialized checkbox state, kept current on every change
+        self.state_hash = 0
 
     def reset(self) -> None:
         self.meta.clear()
         self.checks.clear()
+        self.checked_by_type.clear()
         self._key_index.clear()
+        self.children.clear()
+        self.parents.clear()
+        self.labels.clear()
+        self.materialized.clear()
+        self._uniform.clear()
+        self._next_id = 0
+        self.state_hash = 0
+
+    def _entry_hash(self, iid: str, state: bool) -> int:
+        # Contribution of one serialized entry; nodes without a logical key are not serialized
+        key = self.logical_key_for_iid(iid)
+        return hash((key, bool(state))) if key else 0
+
+    def add_node(self, parent: str, label: str, meta: TreeNodeMeta, checked: bool) -> str:
+        """Register a node under `parent` ("" for top level) and return its new iid."""
+        iid = f"n{self._next_id}"
+        self._next_id += 1
+        self.children.setdefault(parent, []).append(iid)
+        self.parents[iid] = parent
+        self.labels[iid] = label
+        self.set_meta(iid, meta)
+        self.set_checked(iid, checked)
+        return iid
+
+    def children_of(self, iid: str) -> List[str]:
+        return self.children.get(iid, [])
+
+    def parent_of(self, iid: str) -> str:
+        return self.parents.get(iid, "")
+
+    def is_inserted(self, iid: str) -> bool:
+        """True when the node currently exists in the Treeview (its parent is materialized)."""
+        parent = self.parents.get(iid)
+        return parent is not None and parent in self.materialized
+
+    def remove_node(self, iid: str) -> None:
+        """Drop a node and its subtree from the hierarchy, metadata and checkbox state."""
+        parent = self.parents.get(iid)
+        if parent is not None:
+            siblings = self.children.get(parent)
+            if siblings is not None:
+                siblings.remove(iid)
+        self._drop_subtree(iid)
+
+    def retain_children(self, parent: str, keep: AbstractSet[str]) -> None:
+        """Drop every child of `parent` (with its subtree) that is not in `keep`, in one pass."""
+        children = self.children.get(parent)
+        if not children:
+            return
+        kept = [ch for ch in children if ch in keep]
+        if len(kept) == len(children):
+            return
+        dropped = [ch for ch in children if ch not in keep]
+        children[:] = kept
+        for ch in dropped:
+            self._drop_subtree(ch)
+
+    def _drop_subtree(self, iid: str) -> None:
+        # The caller has already unlinked `iid` from its parent's child list
+        stack = [iid]
+        while stack:
+            node = stack.pop()
+            stack.extend(self.children.pop(node, ()))
+            self.parents.pop(node, None)
+            if node in self.checks:
+                self.state_hash = (self.state_hash - self._entry_hash(node, self.checks.pop(node))) & _HASH_MASK
+            meta = self.meta.pop(node, None)
+            if meta is not None:
+                if self._key_index.get(meta.key) == node:
+                    del self._key_index[meta.key]
+                bucket = self.checked_by_type.get(meta.node_type)
+                if bucket:
+                    bucket.discard(node)
+            self.labels.pop(node, None)
+            self.materialized.discard(node)
+            self._uniform.pop(node, None)
 
     def set_meta(self, iid: str, meta: TreeNodeMeta) -> None:
+        checked = self.checks.get(iid)
+        if checked is not None:
+            # The logical key is part of the entry hash; swap the old contribution for the new one
+            self.state_hash = (self.state_hash - self._entry_hash(iid, checked)) & _HASH_MASK
+            self._bucket(iid, False)
         self.meta[iid] = meta
-        key = self.logical_key_for_iid(iid)
-        if key:
-            self._key_index[key] = iid
+        self._key_index[meta.key] = iid
+        if checked is not None:
+            self.state_hash = (self.state_hash + self._entry_hash(iid, checked)) & _HASH_MASK
+            self._bucket(iid, checked)
+
+    def _bucket(self, iid: str, state: bool) -> None:
+        # Move `iid` into or out of its type's checked set (called whenever its state changes)
+        changed = self._changed
+        if changed is not None:
+            changed.add(iid)
+        meta = self.meta.get(iid)
+        if meta is None:
+            return
+        bucket = self.checked_by_type.get(meta.node_type)
+        if state:
+            if bucket is None:
+                bucket = self.checked_by_type[meta.node_type] = set()
+            bucket.add(iid)
+        elif bucket is not None:
+            bucket.discard(iid)
+
+    def logical_keys(self) -> KeysView[tuple[str, str, Optional[str]]]:
+        """Live view of the logical keys of all registered nodes."""
+        return self._key_index.keys()
 
     def get_meta(self, iid: str) -> Optional[TreeNodeMeta]:
         return self.meta.get(iid)
 
+    def _forget_uniform(self, iid: str) -> None:
+        # `iid` changed, so neither it nor any ancestor is known to be uniform any more
+        uniform = self._uniform
+        parents = self.parents
+        while iid:
+            uniform.pop(iid, None)
+            iid = parents.get(iid, "")
+
     def set_checked(self, iid: str, state: bool) -> None:
+        old = self.checks.get(iid)
         self.checks[iid] = state
+        if self._uniform:
+            self._forget_uniform(iid)
+        if old is None:
+            self.state_hash = (self.state_hash + self._entry_hash(iid, state)) & _HASH_MASK
+            self._bucket(iid, state)
+        elif bool(old) != bool(state):
+            self.state_hash = (self.state_hash - self._entry_hash(iid, old) + self._entry_hash(iid, state)) & _HASH_MASK
+            self._bucket(iid, state)
+
+    @contextmanager
+    def batch(self) -> Iterator[Set[str]]:
+        """
+        Collect the iids whose checkbox state changes inside the block into the yielded set,
+        so a caller can refresh just those rows once at the end. Nested blocks feed the outer one.
+        """
+        outer = self._changed
+        changed: Set[str] = set()
+        self._changed = changed
+        try:
+            yield changed
+        finally:
+            self._changed = outer
+            if outer is not None:
+                outer |= changed
+
+    def set_subtree_checked(self, root: str, state: bool) -> List[str]:
+        """
+        Set `root` and every descendant to `state` in one walk; returns the iids that were visited.
+        Subtrees already known to be entirely in `state` are skipped (their nodes are not returned).
+        """
+        checks = self.checks
+        children = self.children
+        uniform = self._uniform
+        entry_hash = self._entry_hash
+        bucket = self._bucket
+        if uniform:
+            # The change affects every ancestor's subtree
+            self._forget_uniform(self.parents.get(root, ""))
+        delta = 0
+        visited: List[str] = []
+        stack = [root]
+        while stack:
+            iid = stack.pop()
+            if uniform.get(iid) == state:
+                continue
+            uniform[iid] = state
+            visited.append(iid)
+            old = checks.get(iid)
+            checks[iid] = state
+            if old is None:
+                delta += entry_hash(iid, state)
+                bucket(iid, state)
+            elif bool(old) != bool(state):
+                delta += entry_hash(iid, state) - entry_hash(iid, old)
+                bucket(iid, state)
+            kids = children.get(iid)
+            if kids:
+                stack.extend(kids)
+        self.state_hash = (self.state_hash + delta) & _HASH_MASK
+        return visited
 
     def get_checked(self, iid: str, default: bool = False) -> bool:
         return self.checks.get(iid, default)
 
     def logical_key_for_iid(self, iid: str) -> Optional[tuple[str, str, Optional[str]]]:
         """Return a stable (node_type, name, parent) key for an item."""
-        meta = self.get_meta(iid)
-        if not meta:
-            return None
-        return (meta.node_type.name, meta.name, meta.parent)
+        meta = self.meta.get(iid)
+        return meta.key if meta is not None else None
 
     def serialize(self) -> list[dict[str, Any]]:
         """Serialize checkbox state with logical keys for persistence."""
         out: list[dict[str, Any]] = []
+        meta_map = self.meta
         for iid, state in self.checks.items():
-            key = self.logical_key_for_iid(iid)
-            if not key:
+            meta = meta_map.get(iid)
+            if meta is None:
                 continue
-            node_type_name, name, parent = key
+            node_type_name, name, parent = meta.key
             out.append(
                 {
                     "node_type": node_type_name,
@@ -79,12 +276,14 @@ class TreeState:
             (entry.get("node_type"), entry.get("name"), entry.get("parent")): bool(entry.get("state", False))
             for entry in saved
         }
+        # Plain writes only; the caller settles parent states afterwards in one pass
+        set_checked = self.set_checked
         for iid, meta in self.meta.items():
-            key = self.logical_key_for_iid(iid)
-            if key and key in target:
-                self.checks[iid] = target[key]
+            state = target.get(meta.key)
+            if state is not None:
+                set_checked(iid, state)
 
-    def update_parent_states(self, tree, selected_item_id: Optional[str]) -> Optional[bool]:
+    def update_parent_states(self, selected_item_id: Optional[str]) -> Optional[bool]:
         """
         Bubble up selection states: a parent is selected if any child is selected.
         Returns the new state of the selected item, if any.
@@ -94,14 +293,22 @@ class TreeState:
         else:
             anchor = None
 
-        for iid in list(self.meta.keys()):
-            parent = tree.parent(iid)
-            while parent:
-                child_states = [self.get_checked(ch, False) for ch in tree.get_children(parent)]
-                new_state = any(child_states)
-                if self.get_checked(parent, False) != new_state:
-                    self.set_checked(parent, new_state)
-                parent = tree.parent(parent)
+        # One post-order pass: collect parents top-down, then settle them bottom-up so each
+        # parent is computed once from already-settled children
+        children = self.children
+        checks = self.checks
+        parents: List[str] = []
+        stack = list(children.get("", ()))
+        while stack:
+            iid = stack.pop()
+            kids = children.get(iid)
+            if kids:
+                parents.append(iid)
+                stack.extend(kids)
+        for iid in reversed(parents):
+            new_state = any(map(checks.get, children[iid]))
+            if checks.get(iid, False) != new_state:
+                self.set_checked(iid, new_state)
 
         if anchor:
             return self.get_checked(anchor, False)
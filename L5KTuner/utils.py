@@ -6,14 +6,35 @@
 
 
 from __future__ import annotations
+import functools
 import logging
 import os
 import pathlib
+import re
 from typing import Optional
 
+from .patterns import RE_AOI_PARAM, RE_AOI_LOCALTAG
+
+
+# Lines up to this length go through the cache; longer ones are nearly always unique
+_PAREN_CACHE_MAX_LEN = 128
+
 
 def paren_delta(line: str) -> int:
     """Return net '(' - ')' on this line, ignoring parentheses inside strings."""
+    if len(line) <= _PAREN_CACHE_MAX_LEN:
+        return _paren_delta_cached(line)
+    return _paren_delta(line)
+
+
+def _paren_delta(line: str) -> int:
+    # Most lines have no string literal (or no escapes in it): count in C.
+    # With quotes, the even '"'-split segments are the text outside strings.
+    if '"' not in line:
+        return line.count('(') - line.count(')')
+    if '\\' not in line:
+        outside = "".join(line.split('"')[::2])
+        return outside.count('(') - outside.count(')')
     delta = 0
     in_str = False
     esc = False
@@ -36,26 +57,33 @@ def paren_delta(line: str) -> int:
     return delta
 
 
+# Short lines (")", "];", rung and member boilerplate) repeat thousands of times per file
+_paren_delta_cached = functools.lru_cache(maxsize=8192)(_paren_delta)
+
+
 def extract_block_name(header_line: str, header: str) -> Optional[str]:
     """
     Extracts the name from lines like:
       'DATATYPE  DateTime (Description := "...")'
       'ADD_ON_INSTRUCTION_DEFINITION  MyAOI (Version := 1.0)'
     """
-    import re
-    m = re.search(r'^' + re.escape(header) + r'\s+([^\s(]+)', header_line)
+    m = _block_name_re(header).match(header_line)
     return m.group(1) if m else None
 
 
+@functools.lru_cache(maxsize=None)
+def _block_name_re(header: str) -> re.Pattern[str]:
+    """Compiled '<header> <name>' pattern; only a couple of distinct headers are ever used."""
+    return re.compile(re.escape(header) + r'\s+([^\s(]+)')
+
+
 def match_aoi_param_name(stripped_line: str) -> Optional[str]:
-    import re
-    m = re.match(r'^([\w]+)\s+(?:OF|:)\s+([\w\.]+)', stripped_line)
+    m = RE_AOI_PARAM.match(stripped_line)
     return m.group(1) if m else None
 
 
 def match_aoi_local_name(stripped_line: str) -> Optional[str]:
-    import re
-    m = re.match(r'^([\w]+)\s*:\s*([\w]+)', stripped_line)
+    m = RE_AOI_LOCALTAG.match(stripped_line)
     return m.group(1) if m else None
 
 
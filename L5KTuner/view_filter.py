@@ -6,43 +6,59 @@
 
 
 from __future__ import annotations
-from typing import Set
+from typing import AbstractSet, Optional, Set
 
 from .tree_state import TreeState
 
 
-def apply_filter(tree, state: TreeState, mode: str) -> None:
+def filter_keep_set(state: TreeState, mode: str) -> frozenset[str]:
     """
-    Filter a ttk.Treeview in-place based on checkbox state.
-    Keeps enabled/disabled nodes and their ancestors, pruning everything else.
+    Nodes that survive `mode` ("enabled"/"disabled"): matching nodes plus their ancestors.
     """
-    if mode == "all":
-        return
+    # Start from the matching nodes (TreeState already indexes the checked ones by type)
+    # and climb to the roots, instead of visiting every node of the hierarchy
+    checked: Set[str] = set().union(*state.checked_by_type.values())
+    if mode == "enabled":
+        matches: AbstractSet[str] = checked
+    else:
+        matches = state.parents.keys() - checked
 
     keep: Set[str] = set()
-
-    def dfs(iid: str) -> bool:
-        checked = state.get_checked(iid, False)
-        child_ids = list(tree.get_children(iid))
-        child_keeps = [dfs(ch) for ch in child_ids]
-        if mode == "enabled":
-            keep_me = checked or any(child_keeps)
-        else:
-            keep_me = (not checked) or any(child_keeps)
-        if keep_me:
+    parents = state.parents
+    for iid in matches:
+        # Stop at the first ancestor already kept: everything above it is kept too
+        while iid and iid not in keep:
             keep.add(iid)
-        return keep_me
+            iid = parents.get(iid, "")
+    return frozenset(keep)
+
 
-    for root in tree.get_children(""):
-        dfs(root)
+def apply_filter(tree, state: TreeState, mode: str,
+                 keep: Optional[AbstractSet[str]] = None) -> Optional[AbstractSet[str]]:
+    """
+    Filter the tree in-place based on checkbox state.
+    Keeps enabled/disabled nodes and their ancestors, pruning everything else from the
+    TreeState hierarchy (and from the Treeview for nodes that are already inserted).
+    `keep` may be a set previously returned for the same tree and states; the set used is returned.
+    """
+    if mode == "all":
+        return None
+    if keep is None:
+        keep = filter_keep_set(state, mode)
 
     def prune(iid: str) -> None:
-        for ch in list(tree.get_children(iid)):
+        children = state.children_of(iid)
+        if not children:
+            return
+        if iid in state.materialized:
+            # A materialized parent has all of its children inserted, so no per-row exists()
+            # query is needed; one delete call covers every pruned child
+            shown = [ch for ch in children if ch not in keep]
+            if shown:
+                tree.delete(*shown)
+        state.retain_children(iid, keep)
+        for ch in state.children_of(iid):
             prune(ch)
-        if iid not in keep:
-            tree.delete(iid)
-            state.meta.pop(iid, None)
-            state.checks.pop(iid, None)
 
-    for root in list(tree.get_children("")):
-        prune(root)
+    prune("")
+    return keep
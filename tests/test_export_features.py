@@ -128,6 +128,10 @@ END_CONTROLLER
     parent = udt.members["ZZZZZZZZZZHidden"]
     assert parent.is_hidden_parent
     assert set(parent.children.keys()) == {"A", "B"}
+    # BIT aliases are listed under their word, not at the top level
+    assert [m.name for m in udt.visible_members()] == ["ZZZZZZZZZZHidden"]
+    udt.remove_member("ZZZZZZZZZZHidden")
+    assert udt.visible_members() == []
 
 
 def test_program_description_captured_and_exported():
@@ -178,3 +182,134 @@ END_CONTROLLER
     })
     assert "ROUTINE" not in out
     assert "KeepMe" in out
+
+
+def test_to_l5k_into_matches_to_l5k():
+    sample = """(*******)
+CONTROLLER C ()
+DATATYPE U (Description := "u")
+    SINT ZZZZZZZZZZHidden (Hidden := 1);
+        BIT A ZZZZZZZZZZHidden : 0;
+    DINT Count;
+END_DATATYPE
+ADD_ON_INSTRUCTION_DEFINITION Inner ()
+PARAMETERS
+    P OF Word.3 (Usage := Output,
+                 Description := "bit");
+END_PARAMETERS
+LOCAL_TAGS
+    Word : DINT ();
+END_LOCAL_TAGS
+END_ADD_ON_INSTRUCTION_DEFINITION
+TAG
+    T1 : DINT (Description := "d") := 1;
+END_TAG
+END_CONTROLLER
+"""
+    parser = lp.L5KParser(sample)
+    project, _ = parser.parse()
+    aoi = project.aois["Inner"]
+    aoi.parameters["P"].is_bit_alias = True
+    # Expected lines are what the list-returning emitters produced before to_l5k_into existed
+    expected = [
+        (aoi.parameters["P"], [
+            "\t\t\tP : BOOL (",
+            "\t\t\t\tUsage := Output,",
+            '\t\t\t\t             Description := "bit"',
+            "\t\t\t);",
+        ]),
+        (aoi.localtags["Word"], ["\t\t\tWord : DINT ();"]),
+        (project.tags["T1"], ['\t\t\tT1 : DINT (Description := "d");']),
+    ]
+    for obj, lines in expected:
+        out = ["keep"]
+        obj.to_l5k_into(out, 3, "\t")
+        assert out == ["keep"] + lines
+        assert obj.to_l5k(level=3, indent="\t") == lines
+    out = ["keep"]
+    project.udts["U"].to_l5k_into(out, "\t")
+    assert out == [
+        "keep",
+        '\tDATATYPE U (Description := "u", FamilyType := NoFamily)',
+        "\t\tSINT ZZZZZZZZZZHidden (Hidden := 1);",
+        "\t\tBIT A ZZZZZZZZZZHidden : 0;",
+        "\t\tDINT Count;",
+        "\tEND_DATATYPE",
+    ]
+
+
+def test_encode_l5k_string_escapes():
+    from L5KTuner.strings import encode_l5k_string
+    assert encode_l5k_string('a$b"c\'d\r\ne') == "a$$b$\"c$'d$R$Ne"
+    assert encode_l5k_string("$N") == "$$N"
+    assert encode_l5k_string(None) == ""
+
+
+def test_export_whitelist_to_file_matches_string_export():
+    import io
+    sample = """(*******)
+CONTROLLER C ()
+DATATYPE U (Description := "u")
+    DINT Count;
+END_DATATYPE
+ADD_ON_INSTRUCTION_DEFINITION A (Description := "a")
+PARAMETERS
+    P : BOOL (Usage := Input);
+END_PARAMETERS
+LOCAL_TAGS
+    L : DINT ();
+END_LOCAL_TAGS
+END_ADD_ON_INSTRUCTION_DEFINITION
+TAG
+    T1 : DINT (Description := "d") := 1;
+END_TAG
+PROGRAM Main ()
+TAG
+    PT : BOOL := 0;
+END_TAG
+END_PROGRAM
+END_CONTROLLER
+"""
+    parser = lp.L5KParser(sample)
+    project, _ = parser.parse()
+    parser.project = project
+    selections = [
+        {},
+        {
+            "udts": {"U"}, "udt_members": {"U": {"Count"}},
+            "aois": {"A"}, "aoi_parameters": {"A": {"P"}}, "aoi_localtags": {"A": {"L"}},
+            "tags": {"T1"}, "program_tags": {"Main": {"PT"}},
+        },
+    ]
+    for selection in selections:
+        buf = io.StringIO()
+        parser.export_whitelist_to_file(selection, buf)
+        assert buf.getvalue() == parser.export_whitelist(selection)
+        raw = io.BytesIO()
+        parser.export_whitelist_to_binary(selection, raw)
+        assert raw.getvalue() == parser.export_whitelist(selection).encode("utf-8")
+
+
+def test_aoi_local_tags_block_only_when_needed():
+    sample = """(*******)
+CONTROLLER C ()
+ADD_ON_INSTRUCTION_DEFINITION A ()
+PARAMETERS
+    P : BOOL (Usage := Input);
+END_PARAMETERS
+LOCAL_TAGS
+    L : DINT ();
+END_LOCAL_TAGS
+END_ADD_ON_INSTRUCTION_DEFINITION
+END_CONTROLLER
+"""
+    # Pulled in only by a parameter: no LOCAL_TAGS block
+    out = _run_export(sample, {"aoi_parameters": {"A": {"P"}}})
+    assert "\tADD_ON_INSTRUCTION_DEFINITION A ()" in out
+    assert "LOCAL_TAGS" not in out
+    assert "\tEND_ADD_ON_INSTRUCTION_DEFINITION" in out
+
+    # Selected outright: block kept, with the placeholder when no locals are selected
+    out = _run_export(sample, {"aois": {"A"}, "aoi_parameters": {"A": {"P"}}})
+    assert "\t\tLOCAL_TAGS" in out
+    assert "__PlaceHolder" in out
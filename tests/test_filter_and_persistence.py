@@ -109,3 +109,26 @@ def test_project_save_load_round_trip(tmp_path):
             assert app2.tree_state.get_checked(iid) is False
             found = True
     assert found
+
+
+def test_tree_children_inserted_on_expand():
+    app = _build_app_with_project()
+    tag_root = next(iid for iid, meta in app.tree_state.meta.items()
+                    if meta.node_type == models.MemberType.ROOT_CONTROLLER_TAGS)
+    t1 = next(iid for iid, meta in app.tree_state.meta.items()
+              if meta.node_type == models.MemberType.TAG and meta.name == "T1")
+
+    # Only top-level nodes exist until their parent is expanded
+    assert not app.tree.exists(t1)
+    app.tree.focus(tag_root)
+    app._on_tree_open()
+    assert app.tree.exists(t1)
+    assert app.tree.item(t1, "text") == "T1 : DINT"
+
+    # Toggling an unexpanded subtree still updates every descendant's state
+    udt_id = next(iid for iid, meta in app.tree_state.meta.items()
+                  if meta.node_type == models.MemberType.UDT)
+    member_id = app.tree_state.children_of(udt_id)[0]
+    app._set_state(udt_id, False, bubble_up=True)
+    assert app.tree_state.get_checked(member_id) is False
+    assert not app.tree.exists(member_id)
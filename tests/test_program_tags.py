@@ -36,3 +36,14 @@ END_CONTROLLER
     assert "PT2 : DINT" in out
     assert "PT1" not in out
     assert "CtrlTag" not in out  # not selected
+
+
+def test_program_header_line_cache_tracks_description():
+    from L5KTuner import models
+    parser = lp.L5KParser("")
+    prog = models.Program("Main", "first")
+    assert parser._render_program_header_line(prog) == '\tPROGRAM Main (Description := "first")'
+    assert parser._render_program_header_line(prog) == '\tPROGRAM Main (Description := "first")'
+    prog.description = ""
+    assert parser._render_program_header_line(prog) == "\tPROGRAM Main"
+    assert parser._render_program_header_line(prog, indent="  ") == "  PROGRAM Main"
@@ -78,3 +78,35 @@ def test_project_roundtrip_without_gui(tmp_path):
     # Ensure state survives
     assert ts2.get_checked("t1") is True
     assert ts2.get_checked("t2") is False
+
+
+def test_write_json_worker_splice_matches_plain_dump(tmp_path):
+    pytest.importorskip("tkinter")
+    import L5KTuner.gui as gui
+
+    data = {
+        "controller_header_lines": ["CONTROLLER Ctrl (ProcessorType := \"1756-L83E\")"],
+        "controller_name": "Ctrl",
+        "header_text": "(* été \"quoted\" *)",
+        "checkbox_states": {"t1": True, "t2": False},
+    }
+    project = {
+        "header": "(* header *)",
+        "udts": [],
+        "aois": [],
+        "tags": [{"name": "T1", "data_type": "DINT", "description": "", "definition": "T1 : DINT;"}],
+        "programs": [],
+    }
+    expected = {**data, "project": project}
+
+    path = tmp_path / "spliced.l5kproj"
+    project_json = gui._write_json_worker(str(path), data, project)
+    assert json.loads(path.read_text(encoding="utf-8")) == expected
+
+    # Passing the returned section text back in must produce the same document
+    path2 = tmp_path / "reused.l5kproj"
+    assert gui._write_json_worker(str(path2), data, project_json) == project_json
+    assert json.loads(path2.read_text(encoding="utf-8")) == expected
+
+    with pytest.raises(AssertionError):
+        gui._write_json_worker(str(tmp_path / "dup.l5kproj"), expected, project)
@@ -20,3 +20,103 @@ def test_tree_state_serialize_restore_roundtrip():
 
     assert state2.get_checked("root") is True
     assert state2.get_checked("child") is False
+
+
+def test_tree_state_hash_tracks_checkbox_changes():
+    state = TreeState()
+    root = state.add_node("", "Controller Tags", TreeNodeMeta(MemberType.ROOT_CONTROLLER_TAGS, "Controller Tags"), True)
+    t1 = state.add_node(root, "T1 : DINT", TreeNodeMeta(MemberType.TAG, "T1"), True)
+    state.add_node(root, "T2 : BOOL", TreeNodeMeta(MemberType.TAG, "T2"), True)
+    saved = state.state_hash
+
+    state.set_checked(t1, False)
+    assert state.state_hash != saved
+    state.set_checked(t1, True)
+    assert state.state_hash == saved
+
+    # Same entries built in a different order hash the same
+    other = TreeState()
+    other_root = other.add_node("", "Controller Tags",
+                                TreeNodeMeta(MemberType.ROOT_CONTROLLER_TAGS, "Controller Tags"), True)
+    other.add_node(other_root, "T2 : BOOL", TreeNodeMeta(MemberType.TAG, "T2"), True)
+    other.add_node(other_root, "T1 : DINT", TreeNodeMeta(MemberType.TAG, "T1"), True)
+    assert other.state_hash == saved
+
+    # Subtree updates keep the hash in step with per-node updates
+    assert set(state.set_subtree_checked(root, False)) == {root, t1} | set(state.children_of(root))
+    assert state.get_checked(t1) is False
+    state.set_subtree_checked(root, True)
+    assert state.state_hash == saved
+    # A subtree already set as a whole is skipped until one of its nodes changes
+    assert state.set_subtree_checked(root, True) == []
+    state.set_checked(t1, False)
+    assert state.set_subtree_checked(root, True) != []
+    assert state.get_checked(t1) is True and state.state_hash == saved
+
+    state.remove_node(t1)
+    assert state.state_hash != saved
+    assert state.children_of(root) and t1 not in state.children_of(root)
+
+
+def test_checked_by_type_follows_checks():
+    state = TreeState()
+    root = state.add_node("", "Controller Tags", TreeNodeMeta(MemberType.ROOT_CONTROLLER_TAGS, "Controller Tags"), True)
+    t1 = state.add_node(root, "T1 : DINT", TreeNodeMeta(MemberType.TAG, "T1"), True)
+    t2 = state.add_node(root, "T2 : BOOL", TreeNodeMeta(MemberType.TAG, "T2"), False)
+    assert state.checked_by_type[MemberType.TAG] == {t1}
+
+    state.set_subtree_checked(root, True)
+    assert state.checked_by_type[MemberType.TAG] == {t1, t2}
+    state.set_checked(t2, False)
+    state.remove_node(t1)
+    assert not state.checked_by_type[MemberType.TAG]
+    assert state.checked_by_type[MemberType.ROOT_CONTROLLER_TAGS] == {root}
+
+
+def test_filter_keep_set_keeps_matching_nodes_and_ancestors():
+    from L5KTuner.view_filter import apply_filter, filter_keep_set
+
+    state = TreeState()
+    root = state.add_node("", "Controller Tags", TreeNodeMeta(MemberType.ROOT_CONTROLLER_TAGS, "Controller Tags"), True)
+    t1 = state.add_node(root, "T1 : DINT", TreeNodeMeta(MemberType.TAG, "T1"), True)
+    t2 = state.add_node(root, "T2 : BOOL", TreeNodeMeta(MemberType.TAG, "T2"), False)
+
+    assert filter_keep_set(state, "disabled") == {root, t2}
+
+    # Nothing is shown in a Treeview yet, so the tree argument is never touched
+    keep = apply_filter(None, state, "disabled")
+    assert keep == {root, t2}
+    assert state.children_of(root) == [t2]
+    assert state.get_meta(t1) is None and state.logical_key_for_iid(t1) is None
+
+
+def test_update_parent_states_settles_nested_parents():
+    state = TreeState()
+    root = state.add_node("", "User-Defined Types", TreeNodeMeta(MemberType.ROOT_UDT, "User-Defined Types"), True)
+    udt = state.add_node(root, "U1", TreeNodeMeta(MemberType.UDT, "U1"), True)
+    word = state.add_node(udt, "W : SINT", TreeNodeMeta(MemberType.UDT_MEMBER, "W", parent="U1"), True)
+    bit = state.add_node(word, "B : BIT", TreeNodeMeta(MemberType.UDT_MEMBER, "B", parent="U1"), False)
+    other = state.add_node(root, "U2", TreeNodeMeta(MemberType.UDT, "U2"), False)
+
+    assert state.update_parent_states(udt) is False
+    assert [state.get_checked(i) for i in (root, udt, word, bit, other)] == [False, False, False, False, False]
+
+    state.set_checked(bit, True)
+    assert state.update_parent_states(None) is None
+    assert [state.get_checked(i) for i in (root, udt, word)] == [True, True, True]
+
+
+def test_batch_collects_changed_iids():
+    state = TreeState()
+    root = state.add_node("", "Controller Tags", TreeNodeMeta(MemberType.ROOT_CONTROLLER_TAGS, "Controller Tags"), True)
+    t1 = state.add_node(root, "T1 : DINT", TreeNodeMeta(MemberType.TAG, "T1"), True)
+    t2 = state.add_node(root, "T2 : BOOL", TreeNodeMeta(MemberType.TAG, "T2"), False)
+
+    with state.batch() as changed:
+        state.set_checked(t1, True)  # unchanged
+        with state.batch():
+            state.set_subtree_checked(t2, True)
+        state.set_checked(root, False)
+    assert changed == {t2, root}
+    state.set_checked(t1, False)
+    assert changed == {t2, root}